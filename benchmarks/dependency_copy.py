@@ -0,0 +1,73 @@
+"""Compare `Dependency.copy` with the copying via `deepcopy` it replaced.
+
+Run:
+
+    python -m benchmarks.dependency_copy benchmarks/universes/small.json --number 1000
+"""
+# built-in
+import json
+import sys
+from argparse import ArgumentParser
+from copy import deepcopy
+from pathlib import Path
+from timeit import timeit
+from typing import Any, Dict, List
+
+# project
+from dephell.models import Dependency
+
+# app
+from .resolver import _resolve
+
+
+def deepcopy_dependency(dep: Dependency) -> Dependency:
+    """The old implementation of `Dependency.copy`.
+    """
+    obj = deepcopy(dep)
+    obj.constraint = deepcopy(dep.constraint)
+    if obj.locked:
+        obj.unlock()
+    return obj
+
+
+def run_universe(data: Dict[str, Any], number: int = 1000) -> Dict[str, Any]:
+    """Copy every dependency of the resolved universe `number` times in both ways.
+    """
+    resolver, resolved, _ = _resolve(data)
+    deps = [dep for dep in resolver.graph if 'groups' in dep.__dict__]
+
+    def copy_all(copy) -> None:
+        for dep in deps:
+            copy(dep)
+
+    old = timeit(lambda: copy_all(deepcopy_dependency), number=number)
+    new = timeit(lambda: copy_all(Dependency.copy), number=number)
+    copies = number * len(deps)
+    return dict(
+        universe=data.get('name', 'root'),
+        resolved=resolved,
+        deps=len(deps),
+        deepcopy=old / copies,
+        copy=new / copies,
+        speedup=old / new,
+    )
+
+
+def main(argv: List[str]) -> int:
+    parser = ArgumentParser(description='dependency copying benchmark')
+    parser.add_argument('paths', nargs='+', type=Path, help='universes to resolve')
+    parser.add_argument('--number', type=int, default=1000, help='how many times copy every dependency')
+    args = parser.parse_args(argv)
+
+    results = []
+    for path in args.paths:
+        with path.open() as stream:
+            data = json.load(stream)
+        data.setdefault('name', path.stem)
+        results.append(run_universe(data, number=args.number))
+    print(json.dumps(results, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,100 @@
+"""Measure how long dephell imports modules to run a command.
+
+Run:
+
+    python -m benchmarks.importtime --repeat 5 --output importtime.json
+
+With `--check` it fails if a command imports modules of other commands.
+"""
+# built-in
+import json
+import os
+import subprocess
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, Dict, List, Sequence
+
+
+ROOT = Path(__file__).parent.parent
+COMMANDS = (
+    ('inspect', 'self'),
+    ('deps', 'convert'),
+)
+# modules of `dephell.commands` that are needed for any command
+COMMON_MODULES = frozenset({'dephell.commands.base', 'dephell.commands.discover'})
+
+
+def parse_importtime(output: str) -> Dict[str, Any]:
+    """Parse output of `python -X importtime`.
+    """
+    modules = dict()  # type: Dict[str, int]
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line.split(':', maxsplit=1)[1].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        modules[parts[2].strip()] = int(parts[0])
+    return dict(
+        modules=len(modules),
+        time=sum(modules.values()) / 10 ** 6,
+        commands=sorted(name for name in modules if name.startswith('dephell.commands.')),
+    )
+
+
+def measure(argv: Sequence[str], repeat: int = 1) -> Dict[str, Any]:
+    """Run the command `repeat` times in a clean directory and get the fastest run.
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(ROOT), env.get('PYTHONPATH')]))
+    results = []
+    for _ in range(repeat):
+        with TemporaryDirectory() as path:
+            process = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-m', 'dephell', *argv, '--nocolors'],
+                cwd=path,
+                env=env,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                universal_newlines=True,
+            )
+        results.append(parse_importtime(process.stderr))
+    result = min(results, key=lambda result: result['time'])
+    result['command'] = ' '.join(argv)
+    return result
+
+
+def get_extra_commands(result: Dict[str, Any]) -> List[str]:
+    """Modules of other commands imported to run the command.
+    """
+    expected = COMMON_MODULES | {'dephell.commands.' + result['command'].replace(' ', '_')}
+    return [name for name in result['commands'] if name not in expected]
+
+
+def main(argv: List[str]) -> int:
+    parser = ArgumentParser(description='import time of dephell commands')
+    parser.add_argument('--repeat', type=int, default=3, help='how many times run every command')
+    parser.add_argument('--output', type=Path, help='path to JSON file for results')
+    parser.add_argument('--check', action='store_true', help='fail if modules of other commands imported')
+    args = parser.parse_args(argv)
+
+    results = [measure(command, repeat=args.repeat) for command in COMMANDS]
+    content = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        args.output.write_text(content)
+    else:
+        print(content)
+
+    if args.check:
+        for result in results:
+            extra = get_extra_commands(result)
+            if extra:
+                print('{} imports other commands: {}'.format(result['command'], ', '.join(extra)))
+                return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
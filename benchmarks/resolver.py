@@ -0,0 +1,216 @@
+"""Replay recorded package universes through the resolver and measure it.
+
+Run:
+
+    python -m benchmarks.resolver benchmarks/universes/*.json --output results.json
+
+Record a new universe from a real project (network required):
+
+    python -m benchmarks.resolver --record universe.json --from pyproject.toml --format poetry
+"""
+# built-in
+import json
+import platform
+import sys
+import tracemalloc
+from argparse import ArgumentParser
+from collections import Counter
+from copy import deepcopy
+from datetime import datetime
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from unittest.mock import patch
+
+# external
+from dephell_specifier import RangeSpecifier
+from packaging.requirements import Requirement as PackagingRequirement
+
+# project
+from dephell import __version__
+from dephell.controllers import DependencyMaker, Graph, Mutator, Resolver
+from dephell.models import Release, RootDependency
+from dephell.repositories import ReleaseRepo
+
+
+TIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
+DEFAULT_TIME = '1970-01-01T00:00:00'
+
+
+class CountingRepo(ReleaseRepo):
+    """ReleaseRepo that counts calls that would be network requests for a real repository.
+    """
+    def __init__(self, *releases, deps=None):
+        super().__init__(*releases, deps=deps)
+        self.calls = Counter()
+
+    def __deepcopy__(self, memo) -> 'CountingRepo':
+        # dependencies are deep copied with their repos, but all copies must share the counter
+        obj = type(self).__new__(type(self))
+        memo[id(self)] = obj
+        for name, value in self.__dict__.items():
+            obj.__dict__[name] = value if name == 'calls' else deepcopy(value, memo)
+        return obj
+
+    def get_releases(self, dep) -> tuple:
+        self.calls['releases'] += 1
+        return super().get_releases(dep)
+
+    async def get_dependencies(self, name: str, version: str, extra: Optional[str] = None) -> tuple:
+        self.calls['dependencies'] += 1
+        return await super().get_dependencies(name=name, version=version, extra=extra)
+
+
+def load_universe(data: Dict[str, Any]) -> RootDependency:
+    """Make root dependency with repository of all releases from the universe.
+    """
+    releases = []
+    deps = dict()
+    for name, versions in data['packages'].items():
+        for version, info in versions.items():
+            python = info.get('python')
+            releases.append(Release(
+                raw_name=name,
+                version=version,
+                time=datetime.strptime(info.get('time', DEFAULT_TIME), TIME_FORMAT),
+                python=RangeSpecifier(python) if python else None,
+            ))
+            reqs = tuple(PackagingRequirement(req) for req in info.get('deps', ()))
+            deps.setdefault(name, dict())[version] = reqs
+            for extra, extra_deps in info.get('extras', {}).items():
+                key = '{}[{}]'.format(name, extra)
+                reqs = tuple(PackagingRequirement(req) for req in extra_deps)
+                deps.setdefault(key, dict())[version] = reqs
+
+    repo = CountingRepo(*releases, deps=deps)
+    root = RootDependency(raw_name=data.get('name', 'root'))
+    root.repo = repo
+    root_deps = []
+    for req in data['root']:
+        for dep in DependencyMaker.from_requirement(source=root, req=PackagingRequirement(req)):
+            dep.repo = repo
+            root_deps.append(dep)
+    root.attach_dependencies(root_deps)
+    return root
+
+
+def record_universe(resolver: Resolver, name: str = 'root') -> Dict[str, Any]:
+    """Dump all releases with loaded dependencies from the resolved graph.
+
+    Releases which dependencies weren't fetched by the resolver aren't recorded.
+    """
+    packages = dict()  # type: Dict[str, Dict[str, Dict[str, Any]]]
+    for dep in resolver.graph:
+        for release in dep.groups.releases:
+            if release.dependencies is None:
+                continue
+            versions = packages.setdefault(dep.base_name, dict())
+            info = versions.setdefault(str(release.version), dict(
+                deps=[],
+                time=release.time.strftime(TIME_FORMAT),
+            ))
+            if release.python:
+                info['python'] = str(release.python)
+            reqs = sorted(str(req) for req in release.dependencies)
+            if dep.extra is None:
+                info['deps'] = reqs
+            else:
+                info.setdefault('extras', dict())[dep.extra] = reqs
+
+    roots = []
+    for root in resolver.graph.get_layer(0):
+        roots.extend(str(dep) for dep in root.dependencies)
+    return dict(name=name, root=sorted(roots), packages=packages)
+
+
+def _resolve(data: Dict[str, Any]) -> Tuple[Resolver, bool, float]:
+    root = load_universe(data)
+    resolver = Resolver(graph=Graph(root), mutator=Mutator())
+    with patch('dephell.controllers._dependency.get_repo', return_value=root.repo):
+        start = perf_counter()
+        resolved = resolver.resolve(silent=True)
+        return resolver, resolved, perf_counter() - start
+
+
+def run_universe(data: Dict[str, Any], repeat: int = 1) -> Dict[str, Any]:
+    """Resolve the universe `repeat` times and collect the stats.
+
+    Memory is measured in a separate run because tracing slows down the resolver.
+    """
+    timings = []
+    for _ in range(repeat):
+        resolver, resolved, timing = _resolve(data)
+        timings.append(timing)
+
+    tracemalloc.start()
+    try:
+        resolver, resolved, _ = _resolve(data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return dict(
+        universe=data.get('name', 'root'),
+        resolved=resolved,
+        packages=len(resolver.graph.deps),
+        mutations=resolver.mutator.mutations,
+        pruned=resolver.mutator.pruned,
+        calls=dict(resolver.graph._roots[0].repo.calls),
+        peak_memory=peak,
+        time=dict(min=min(timings), median=median(timings), max=max(timings)),
+    )
+
+
+def run(paths: Sequence[Path], repeat: int = 1) -> Dict[str, Any]:
+    results = []
+    for path in paths:
+        with path.open() as stream:
+            data = json.load(stream)
+        data.setdefault('name', path.stem)
+        results.append(run_universe(data, repeat=repeat))
+    return dict(
+        dephell=__version__,
+        python=platform.python_version(),
+        implementation=platform.python_implementation(),
+        results=results,
+    )
+
+
+def record(path: Path, source: Path, fmt: str) -> bool:
+    # project
+    from dephell.converters import CONVERTERS
+
+    resolver = CONVERTERS[fmt].load_resolver(path=source)
+    if not resolver.resolve(silent=True):
+        return False
+    data = record_universe(resolver, name=path.stem)
+    with path.open('w') as stream:
+        json.dump(data, stream, indent=2, sort_keys=True)
+    return True
+
+
+def main(argv: List[str]) -> int:
+    parser = ArgumentParser(description='resolver benchmarks on recorded universes')
+    parser.add_argument('paths', nargs='*', type=Path, help='universes to replay')
+    parser.add_argument('--repeat', type=int, default=3, help='how many times resolve every universe')
+    parser.add_argument('--output', type=Path, help='path to JSON file for results')
+    parser.add_argument('--record', type=Path, help='record universe into the given path')
+    parser.add_argument('--from', dest='source', type=Path, help='dependencies file to record')
+    parser.add_argument('--format', default='pip', help='format of dependencies file to record')
+    args = parser.parse_args(argv)
+
+    if args.record:
+        return 0 if record(path=args.record, source=args.source, fmt=args.format) else 1
+
+    results = run(paths=args.paths, repeat=args.repeat)
+    content = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        args.output.write_text(content)
+    else:
+        print(content)
+    return 0 if all(result['resolved'] for result in results['results']) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -9,7 +9,6 @@ from packaging.utils import canonicalize_name
 
 # app
 from ..constants import IS_WINDOWS
-from ..converters import EggInfoConverter
 from ..models import EntryPoint
 
 
@@ -26,6 +25,9 @@ def _get_matching_path(paths: Iterable[Path], name: str) -> Optional[Path]:
 
 
 def get_entrypoints(*, venv: VEnv, name: str) -> Optional[Tuple[EntryPoint, ...]]:
+    # app
+    from ..converters import EggInfoConverter
+
     if not venv.lib_path:
         logger.critical('cannot locate lib path in the venv')
         return None
@@ -3,17 +3,22 @@ from typing import Iterable, List
 
 # app
 from ..controllers import Resolver
-from ..converters import PIPConverter
 from ..models import Dependency
 from ..repositories import get_repo
 
 
 def get_packages(reqs: Iterable[str]) -> List[Dependency]:
+    # app
+    from ..converters import PIPConverter
+
     root = PIPConverter(lock=False).loads('\n'.join(reqs))
     return root.dependencies
 
 
 def get_package(req: str, repo: str = None) -> Dependency:
+    # app
+    from ..converters import PIPConverter
+
     root = PIPConverter(lock=False).loads(req)
     dep = root.dependencies[0]
     if repo is not None:
@@ -22,5 +27,8 @@ def get_package(req: str, repo: str = None) -> Dependency:
 
 
 def get_resolver(reqs: Iterable[str]) -> Resolver:
+    # app
+    from ..converters import PIPConverter
+
     resolver = PIPConverter(lock=False).loads_resolver('\n'.join(reqs))
     return resolver
@@ -1,9 +1,14 @@
 # built-in
 import json
 import pickle
+import sqlite3
+from collections import OrderedDict
+from contextlib import contextmanager
+from logging import getLogger
 from pathlib import Path
+from threading import RLock
 from time import time
-from typing import TYPE_CHECKING, Any, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 # app
 from .cached_property import cached_property
@@ -16,23 +21,382 @@ if TYPE_CHECKING:
     from .models.dependency import Dependency  # noqa: F401
 
 
+logger = getLogger('dephell.cache')
+STORE_NAME = 'cache.sqlite3'
+EXTENSIONS = ('.bin', '.json', '.txt')
+MEMO_SIZE = 512
+# how many bytes of cache entries are read into memory at once on migration
+MIGRATE_CHUNK_SIZE = 16 * 1024 * 1024
+
+
+class Memo:
+    """Bounded LRU of values shared by everything in the process.
+
+    Values are stored as is, don't modify values that you got from the memo.
+    """
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()  # type: OrderedDict
+        self._lock = RLock()
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        with self._lock:
+            value = self._data.get((namespace, key))
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end((namespace, key))
+            self.hits += 1
+            return value
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[namespace, key] = value
+            self._data.move_to_end((namespace, key))
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self._lock:
+            self._data.pop((namespace, key), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return dict(hits=self.hits, misses=self.misses, size=len(self._data))
+
+
+# decoded cache entries, every entry is decoded at most once per process
+memo = Memo(maxsize=MEMO_SIZE)
+
+
+class SQLiteStore:
+    """All cache entries in one SQLite database (WAL mode) indexed by the cache key.
+
+    The key is the path of the entry relative to the cache root,
+    so file-based and SQLite-based caches are interchangeable.
+    """
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = RLock()
+        self._pending = None  # type: Optional[Dict[str, Tuple[bytes, float]]]
+
+    @cached_property
+    def connection(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(self.path), isolation_level=None, check_same_thread=False)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS cache '
+            '(key TEXT PRIMARY KEY, value BLOB NOT NULL, mtime REAL NOT NULL)',
+        )
+        return connection
+
+    def get(self, key: str) -> Optional[Tuple[bytes, float]]:
+        with self._lock:
+            if self._pending is not None and key in self._pending:
+                return self._pending[key]
+            row = self.connection.execute('SELECT value, mtime FROM cache WHERE key = ?', (key, )).fetchone()
+        if row is None:
+            return None
+        return bytes(row[0]), row[1]
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Tuple[bytes, float]]:
+        keys = list(keys)
+        result = dict()
+        with self._lock:
+            # sqlite has a limit on variables count in one query
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                marks = ','.join('?' * len(chunk))
+                query = 'SELECT key, value, mtime FROM cache WHERE key IN ({})'.format(marks)
+                for key, value, mtime in self.connection.execute(query, chunk):
+                    result[key] = bytes(value), mtime
+            if self._pending:
+                for key in keys:
+                    if key in self._pending:
+                        result[key] = self._pending[key]
+        return result
+
+    def set(self, key: str, value: bytes, mtime: Optional[float] = None) -> None:
+        self.set_many([(key, value, time() if mtime is None else mtime)])
+
+    def set_many(self, items: Iterable[Tuple[str, bytes, float]]) -> None:
+        with self._lock:
+            if self._pending is not None:
+                for key, value, mtime in items:
+                    self._pending[key] = value, mtime
+                return
+            with self._transaction() as connection:
+                connection.executemany('INSERT OR REPLACE INTO cache VALUES (?, ?, ?)', items)
+
+    def touch(self, key: str) -> None:
+        with self._lock:
+            if self._pending is not None and key in self._pending:
+                self._pending[key] = self._pending[key][0], time()
+                return
+            self.connection.execute('UPDATE cache SET mtime = ? WHERE key = ?', (time(), key))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if self._pending is not None:
+                self._pending.pop(key, None)
+            self.connection.execute('DELETE FROM cache WHERE key = ?', (key, ))
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Collect all writes and flush them in one transaction.
+        """
+        with self._lock:
+            nested = self._pending is not None
+            if not nested:
+                self._pending = dict()
+        if nested:
+            yield
+            return
+        try:
+            yield
+        finally:
+            with self._lock:
+                pending, self._pending = self._pending, None
+                items = [(key, value, mtime) for key, (value, mtime) in pending.items()]
+                if items:
+                    self.set_many(items)
+
+    def migrate(self, root: Path) -> int:
+        """Move all entries from one-file-per-key cache tree into the store.
+        """
+        count = 0
+        dirs = set()
+        for paths in self._find_entries(root):
+            self.set_many(
+                (path.relative_to(root).as_posix(), path.read_bytes(), path.stat().st_mtime)
+                for path in paths
+            )
+            for path in paths:
+                path.unlink()
+                dirs.add(path.parent)
+            count += len(paths)
+        if not count:
+            # create the database anyway, so next runs don't walk the cache tree again
+            self.connection
+            return 0
+
+        # clean up empty dirs, deepest first
+        for path in sorted(dirs, key=lambda path: len(path.parts), reverse=True):
+            while path != root:
+                try:
+                    path.rmdir()
+                except OSError:
+                    break
+                path = path.parent
+        logger.info('cache migrated', extra=dict(entries=count, path=str(self.path)))
+        return count
+
+    @staticmethod
+    def _find_entries(root: Path) -> Iterator[List[Path]]:
+        """Get paths of cache entries in chunks limited by size of the content.
+        """
+        chunk = []  # type: List[Path]
+        size = 0
+        for path in root.glob('**/*'):
+            if not path.is_file() or path.suffix not in EXTENSIONS:
+                continue
+            # don't touch git repositories clonned into the cache
+            parts = path.relative_to(root).parts
+            if parts[0] == 'git' and (len(parts) < 3 or parts[2] != 'deps'):
+                continue
+            chunk.append(path)
+            size += path.stat().st_size
+            if size >= MIGRATE_CHUNK_SIZE:
+                yield chunk
+                chunk = []
+                size = 0
+        if chunk:
+            yield chunk
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        connection = self.connection
+        connection.execute('BEGIN')
+        try:
+            yield connection
+            connection.execute('COMMIT')
+        finally:
+            if connection.in_transaction:
+                connection.execute('ROLLBACK')
+
+
+_stores = dict()  # type: Dict[str, SQLiteStore]
+
+
+def get_store() -> Optional[SQLiteStore]:
+    """Get store for the current cache backend, None for `files` backend.
+    """
+    if config['cache'].get('backend', 'files') != 'sqlite':
+        return None
+    root = Path(config['cache']['path'])
+    store = _stores.get(str(root))
+    if store is None:
+        path = root / STORE_NAME
+        is_new = not path.exists()
+        store = SQLiteStore(path=path)
+        _stores[str(root)] = store
+        if is_new and root.exists():
+            store.migrate(root)
+    return store
+
+
+@contextmanager
+def batch() -> Iterator[None]:
+    """Write all cache entries dumped inside of the context in one transaction.
+    """
+    store = get_store()
+    if store is None:
+        yield
+        return
+    with store.batch():
+        yield
+
+
+def load_many(caches: Iterable['BaseCache']) -> List[Any]:
+    """Load many cache entries in one query.
+    """
+    caches = list(caches)
+    store = get_store()
+    if store is None:
+        return [cache.load() for cache in caches]
+    entries = dict()  # type: Dict[str, Tuple[Any, float]]
+    for cache in caches:
+        if cache.memoize:
+            entry = memo.get('cache', str(cache.path))
+            if entry is not None:
+                entries[cache.key] = entry
+    rows = store.get_many(cache.key for cache in caches if cache.key not in entries)
+
+    result = []
+    for cache in caches:
+        entry = entries.get(cache.key)
+        if entry is None:
+            row = rows.get(cache.key)
+            if row is None or cache._is_expired(row[1]):
+                result.append(None)
+                continue
+            entry = cache._decode(row[0]), row[1]
+            if cache.memoize:
+                memo.set('cache', str(cache.path), entry)
+        result.append(None if cache._is_expired(entry[1]) else entry[0])
+    return result
+
+
 class BaseCache:
     ext = ''
+    binary = False
+    memoize = False
 
     def __init__(self, *keys, ttl: int = -1):
         self.path = Path(config['cache']['path'], *keys)
         if self.ext:
             self.path = self.path.with_name(self.path.name + self.ext)
+        self.key = Path(*keys).as_posix() + self.ext
+        self.keys = keys
         self.ttl = ttl
-        self._check_ttl()
+        self.store = get_store()
+
+    @cached_property
+    def validators(self) -> 'JSONCache':
+        """Sidecar entry for HTTP validators (ETag, Last-Modified) of the cached response.
+        """
+        return JSONCache('validators', *self.keys)
+
+    def load(self) -> Optional[Any]:
+        entry = self._load_entry()
+        if entry is None or self._is_expired(entry[1]):
+            return None
+        return entry[0]
+
+    def load_stale(self) -> Optional[Any]:
+        """Load the entry even if TTL is expired.
+        """
+        entry = self._load_entry()
+        if entry is None:
+            return None
+        return entry[0]
+
+    def dump(self, data) -> None:
+        self._write(self._encode(data))
+        memo.delete('cache', str(self.path))
+
+    def touch(self) -> None:
+        """Mark the entry as fresh again.
+        """
+        memo.delete('cache', str(self.path))
+        if self.store is not None:
+            self.store.touch(self.key)
+        elif self.path.exists():
+            self.path.touch()
 
-    def _check_ttl(self) -> None:
+    def _decode(self, content):
+        raise NotImplementedError
+
+    def _encode(self, data):
+        raise NotImplementedError
+
+    def _is_expired(self, mtime: float) -> bool:
         if self.ttl < 0:
-            return
+            return False
+        return time() - mtime > self.ttl
+
+    def _load_entry(self) -> Optional[Tuple[Any, float]]:
+        """Get decoded content and mtime of the entry, use the memo if possible.
+        """
+        if self.memoize:
+            entry = memo.get('cache', str(self.path))
+            if entry is not None:
+                return entry
+        row = self._read_row()
+        if row is None:
+            return None
+        entry = self._decode(row[0]), row[1]
+        if self.memoize:
+            memo.set('cache', str(self.path), entry)
+        return entry
+
+    def _read_row(self) -> Optional[Tuple[Union[str, bytes], float]]:
+        if self.store is not None:
+            row = self.store.get(self.key)
+            if row is None:
+                return None
+            return (row[0] if self.binary else row[0].decode('utf8')), row[1]
+
         if not self.path.exists():
+            return None
+        mtime = self.path.stat().st_mtime
+        with self.path.open('rb' if self.binary else 'r') as stream:
+            return stream.read(), mtime
+
+    def _read(self) -> Union[str, bytes, None]:
+        row = self._read_row()
+        if row is None or self._is_expired(row[1]):
+            return None
+        return row[0]
+
+    def _write(self, content: Union[str, bytes]) -> None:
+        if self.store is not None:
+            self.store.set(self.key, content if self.binary else content.encode('utf8'))
             return
-        if time() - self.path.stat().st_mtime > self.ttl:
-            self.path.unlink()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open('wb' if self.binary else 'w') as stream:
+            stream.write(content)
 
     def __str__(self):
         return str(self.path)
@@ -43,51 +407,40 @@ class BaseCache:
 
 class BinCache(BaseCache):
     ext = '.bin'
+    binary = True
 
-    def load(self):
-        if not self.path.exists():
-            return None
-        with self.path.open('rb') as stream:
-            return pickle.load(stream)
+    def _decode(self, content: bytes):
+        return pickle.loads(content)
 
-    def dump(self, data) -> None:
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        with self.path.open('wb') as stream:
-            pickle.dump(data, stream)
+    def _encode(self, data) -> bytes:
+        return pickle.dumps(data)
 
 
 class TextCache(BaseCache):
     ext = '.txt'
+    memoize = True
 
-    def load(self) -> Optional[Any]:
-        if not self.path.exists():
-            return None
-        with self.path.open('r') as stream:
-            return stream.read().split('\n')
+    def _decode(self, content: Union[str, bytes]) -> List[str]:
+        if isinstance(content, bytes):
+            content = content.decode('utf8')
+        return content.split('\n')
 
-    def dump(self, data: List[str]) -> None:
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        with self.path.open('w') as stream:
-            stream.write('\n'.join(data))
+    def _encode(self, data: List[str]) -> str:
+        return '\n'.join(data)
 
 
 class JSONCache(BaseCache):
     ext = '.json'
+    memoize = True
 
-    def load(self) -> Optional[Any]:
-        if not self.path.exists():
+    def _decode(self, content: Union[str, bytes]) -> Optional[Any]:
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError:
             return None
-        with self.path.open('r') as stream:
-            try:
-                return json.load(stream)
-            except json.JSONDecodeError:
-                return None
-        return None
 
-    def dump(self, data: Union[list, dict]) -> None:
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        with self.path.open('w') as stream:
-            json.dump(data, stream)
+    def _encode(self, data: Union[list, dict]) -> str:
+        return json.dumps(data)
 
 
 class RequirementsCache(BaseCache):
@@ -101,6 +454,12 @@ class RequirementsCache(BaseCache):
         return PIPConverter(lock=False)
 
     def load(self) -> Optional[List['Dependency']]:
+        if self.store is not None:
+            content = self._read()
+            if content is None:
+                return None
+            return self.converter.loads(content).dependencies
+
         if not self.path.exists():
             return None
         root = self.converter.load(self.path)
@@ -111,9 +470,14 @@ class RequirementsCache(BaseCache):
         from .controllers import Graph
         from .models import Requirement
 
+        reqs = Requirement.from_graph(graph=Graph(root), lock=False)
+        if self.store is not None:
+            self._write(self.converter.dumps(reqs=reqs, project=root))
+            return
+
         self.path.parent.mkdir(parents=True, exist_ok=True)
         self.converter.dump(
             path=self.path,
             project=root,
-            reqs=Requirement.from_graph(graph=Graph(root), lock=False),
+            reqs=reqs,
         )
@@ -14,6 +14,7 @@ from itertools import islice
 from packaging.requirements import Requirement
 
 # project
+from dephell.cache import batch
 from dephell.constants import DEFAULT_WAREHOUSE
 from dephell.controllers import DependencyMaker
 from dephell.models import RootDependency
@@ -46,7 +47,8 @@ def cache(deps):
                 release.version,
             ))
             tasks.append(task)
-    loop.run_until_complete(asyncio.gather(*tasks))
+    with batch():
+        loop.run_until_complete(asyncio.gather(*tasks))
 
 
 def main():
@@ -2,7 +2,7 @@
 from logging import getLogger
 from pdb import post_mortem
 from sys import argv
-from typing import List
+from typing import Iterable, List
 
 # external
 from dephell_argparse import Command, Parser
@@ -10,24 +10,34 @@ from dephell_argparse import Command, Parser
 # app
 from .commands import COMMANDS
 from .constants import ReturnCodes
+from .daemon import forward
 from .exceptions import ExtraException
 
 
 logger = getLogger('dephell.cli')
-parser = Parser(
-    description='Manage dependencies, projects, virtual environments.',
-    usage='dephell COMMAND [OPTIONS]',
-)
-for handler in COMMANDS.values():
-    parser.add_command(handler=handler)
+
+
+def get_parser(commands: Iterable[str] = COMMANDS) -> Parser:
+    """Make parser with the given commands. Only modules of these commands are imported.
+    """
+    parser = Parser(
+        description='Manage dependencies, projects, virtual environments.',
+        usage='dephell COMMAND [OPTIONS]',
+    )
+    for name in commands:
+        parser.add_command(handler=COMMANDS[name])
+    return parser
 
 
 def main(argv: List[str]) -> int:
+    # run the command in the daemon if it is running
+    code = forward(argv)
+    if code is not None:
+        return code
+
     # print help
-    if not argv:
-        parser._print_message(parser.format_help())
-        return ReturnCodes.OK.value
-    if len(argv) == 1 and argv[0] in ('--help', '-h', 'help', 'commands'):
+    if not argv or (len(argv) == 1 and argv[0] in ('--help', '-h', 'help', 'commands')):
+        parser = get_parser()
         parser._print_message(parser.format_help())
         return ReturnCodes.OK.value
     if len(argv) == 1 and argv[0] in ('-v', '--version'):
@@ -38,11 +48,12 @@ def main(argv: List[str]) -> int:
         argv = list(argv[1:]) + ['--help']
 
     # get command
-    handler = parser.get_command(argv=argv)
-    if not handler:
-        command = Command(argv=argv, commands=parser._handlers.keys())
+    command = Command(argv=argv, commands=COMMANDS)
+    if not command.match:
+        parser = get_parser()
         parser._print_message(parser.format_help(command=command))
         return ReturnCodes.UNKNOWN_COMMAND.value
+    handler = get_parser([command.match]).get_command(argv=argv)
 
     # parse config
     try:
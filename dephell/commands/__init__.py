@@ -1,9 +1,23 @@
+# built-in
+import sys
+
 # app
-from .discover import COMMANDS
+from .discover import COMMANDS, get_class_name
 
 
 __all__ = ['COMMANDS']
 
-# allow to import commands
-locals().update({c.__name__: c for c in COMMANDS.values()})
-__all__.extend(COMMANDS)
+# allow to import commands, modules of commands are imported on the first access
+_CLASSES = {get_class_name(name): name for name in COMMANDS}
+__all__.extend(_CLASSES)
+
+
+def __getattr__(name: str):
+    if name in _CLASSES:
+        return COMMANDS[_CLASSES[name]]
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+
+# module-level __getattr__ is supported only since python 3.7
+if sys.version_info < (3, 7):
+    locals().update({name: COMMANDS[command] for name, command in _CLASSES.items()})
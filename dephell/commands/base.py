@@ -16,7 +16,7 @@ from ..cached_property import cached_property
 from ..config import Config, config, get_data_dir
 from ..constants import CONFIG_NAMES, ENV_VAR_TEMPLATE, GLOBAL_CONFIG_NAME
 from ..controllers import analyze_conflict
-from ..converters import CONVERTERS, InstalledConverter
+from ..converters import CONVERTERS
 
 
 REX_WORD = re.compile(r'([a-z\d])([A-Z])')
@@ -101,6 +101,9 @@ class BaseCommand(CommandHandler):
         return False
 
     def _get_locked(self, default_envs: Set[str] = None):
+        # app
+        from ..converters import InstalledConverter
+
         if 'from' not in self.config:
             python = get_python_env(config=self.config)
             self.logger.debug('choosen python', extra=dict(path=str(python.path)))
@@ -126,7 +129,7 @@ class BaseCommand(CommandHandler):
         # resolve
         if len(resolver.graph._layers) <= 1:  # if it isn't resolved yet
             self.logger.info('build dependencies graph...')
-            resolved = resolver.resolve(silent=self.config['silent'])
+            resolved = resolver.resolve(silent=self.config['silent'], memo=True)
             if not resolved:
                 conflict = analyze_conflict(resolver=resolver)
                 self.logger.warning('conflict was found')
@@ -2,6 +2,7 @@
 # built-in
 from argparse import ArgumentParser
 from pathlib import Path
+from typing import Dict, Set
 
 # app
 from ..actions import get_resolver
@@ -19,6 +20,7 @@ class DepsAddCommand(BaseCommand):
     def build_parser(parser) -> ArgumentParser:
         builders.build_config(parser)
         builders.build_from(parser)
+        builders.build_to(parser)
         builders.build_resolver(parser)
         builders.build_output(parser)
         builders.build_api(parser)
@@ -62,5 +64,68 @@ class DepsAddCommand(BaseCommand):
             project=resolver.graph.metainfo,
         )
 
+        # update lockfile
+        if not converter.lock and self._has_lockfile():
+            names = {dep.name for dep in new_root.dependencies}
+            if not self._update_lockfile(converter=converter, names=names):
+                return False
+
         self.logger.info('added')
         return True
+
+    def _has_lockfile(self) -> bool:
+        dumper_config = self.config.get('to')
+        if not dumper_config or dumper_config['path'] == 'stdout':
+            return False
+        if not CONVERTERS[dumper_config['format']].lock:
+            return False
+        return Path(dumper_config['path']).exists()
+
+    def _get_lock_versions(self) -> Dict[str, str]:
+        """Get versions of all packages from the lockfile.
+        """
+        dumper = CONVERTERS[self.config['to']['format']]
+        dumper = dumper.copy(project_path=Path(self.config['project']))
+        root = dumper.load(path=self.config['to']['path'])
+        locked = dict()
+        for dep in root.dependencies:
+            constraint = str(dep.constraint)
+            if not constraint.startswith('==') or ',' in constraint or '||' in constraint:
+                continue
+            locked[dep.name] = constraint[2:]
+        return locked
+
+    def _update_lockfile(self, converter, names: Set[str]) -> bool:
+        """Resolve dependencies keeping locked versions for not changed packages.
+
+        The graph is seeded with locked versions of all packages. The added packages
+        and everything reachable from them are unpinned and resolved again,
+        so the new packages can bring new versions of already locked dependencies.
+        The resolver falls back to the full resolution if locked versions don't fit.
+        """
+        locked = self._get_lock_versions()
+        resolver = converter.load_resolver(path=self.config['from']['path'])
+        resolver.pins = {name: version for name, version in locked.items() if name not in names}
+        resolver.unpinned = set(names)
+        self.logger.debug('resolving...', extra=dict(pins=len(resolver.pins)))
+        resolved = resolver.resolve(silent=self.config['silent'])
+        if not resolved:
+            conflict = analyze_conflict(resolver=resolver)
+            self.logger.warning('conflict was found')
+            print(conflict)
+            return False
+
+        reqs = Requirement.from_graph(resolver.graph, lock=True)
+        if {req.name: (req.version or '')[2:] for req in reqs} == locked:
+            self.logger.debug('lockfile is up to date', extra=dict(path=self.config['to']['path']))
+            return True
+
+        self.logger.debug('dump lockfile...', extra=dict(path=self.config['to']['path']))
+        dumper = CONVERTERS[self.config['to']['format']]
+        dumper = dumper.copy(project_path=Path(self.config['project']))
+        dumper.dump(
+            path=self.config['to']['path'],
+            reqs=reqs,
+            project=resolver.graph.metainfo,
+        )
+        return True
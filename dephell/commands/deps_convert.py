@@ -8,7 +8,7 @@ from ..actions import attach_deps
 from ..config import builders
 from ..controllers import analyze_conflict
 from ..converters import CONVERTERS
-from ..models import Requirement
+from ..models import Requirement, Target
 from .base import BaseCommand
 
 
@@ -24,6 +24,7 @@ class DepsConvertCommand(BaseCommand):
         builders.build_api(parser)
         builders.build_output(parser)
         builders.build_other(parser)
+        parser.add_argument('--targets', nargs='*', help='Python versions and platforms to lock for')
         return parser
 
     def __call__(self) -> bool:
@@ -57,7 +58,7 @@ class DepsConvertCommand(BaseCommand):
         # resolve (and merge)
         if should_be_resolved:
             self.logger.debug('resolving...')
-            resolved = resolver.resolve(silent=self.config['silent'])
+            resolved = resolver.resolve(silent=self.config['silent'], memo=True)
             if not resolved:
                 conflict = analyze_conflict(resolver=resolver)
                 self.logger.warning('conflict was found')
@@ -65,6 +66,15 @@ class DepsConvertCommand(BaseCommand):
                 return False
             self.logger.debug('resolved')
 
+        # filter out and annotate deps by `--targets`
+        if self.config.get('targets') and should_be_resolved:
+            try:
+                targets = [Target.parse(target) for target in self.config['targets']]
+            except ValueError as e:
+                self.logger.error(e.args[0])
+                return False
+            resolver.apply_targets(targets)
+
         # filter out deps by `--envs`
         if self.config.get('envs'):
             if not should_be_resolved:
@@ -1,5 +1,7 @@
 # built-in
+from collections.abc import Mapping
 from importlib import import_module
+from typing import Dict, Iterable, Iterator  # noqa: F401
 
 
 # keep sorted
@@ -64,6 +66,7 @@ _NAMES = (
 
     'self auth',
     'self autocomplete',
+    'self daemon',
     'self uncache',
     'self upgrade',
 
@@ -78,10 +81,37 @@ _NAMES = (
 )
 
 
-COMMANDS = dict()
-package = __name__.rsplit('.', maxsplit=1)[0]
-for name in _NAMES:
-    module_name = name.replace(' ', '_')
-    class_name = name.title().replace(' ', '') + 'Command'
-    module = import_module('.' + module_name, package=package)
-    COMMANDS[name] = getattr(module, class_name)
+def get_class_name(name: str) -> str:
+    return name.title().replace(' ', '') + 'Command'
+
+
+class _Commands(Mapping):
+    """Command classes by names. Module of a command is imported on the first access.
+    """
+    def __init__(self, names: Iterable[str], package: str) -> None:
+        self._names = tuple(names)
+        self._package = package
+        self._loaded = dict()  # type: Dict[str, type]
+
+    def __getitem__(self, name: str) -> type:
+        command = self._loaded.get(name)
+        if command is not None:
+            return command
+        if name not in self._names:
+            raise KeyError(name)
+        module = import_module('.' + name.replace(' ', '_'), package=self._package)
+        command = getattr(module, get_class_name(name))
+        self._loaded[name] = command
+        return command
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name) -> bool:
+        return name in self._names
+
+
+COMMANDS = _Commands(names=_NAMES, package=__name__.rsplit('.', maxsplit=1)[0])
@@ -74,9 +74,8 @@ class GenerateConfigCommand(BaseCommand):
             if file_path.suffix not in SUFFIXES:
                 continue
             content = None if file_path.is_dir() else file_path.read_text()
-            for converter_name, converter in CONVERTERS.items():
-                if converter.can_parse(path=file_path, content=content):
-                    parsable_files[converter_name].append(file_path.name)
+            for converter_name, _ in CONVERTERS.detect(path=file_path, content=content):
+                parsable_files[converter_name].append(file_path.name)
         for from_format, to_format in PAIRS:
             for from_path in parsable_files[from_format]:
                 for to_path in parsable_files[to_format]:
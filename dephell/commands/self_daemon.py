@@ -0,0 +1,29 @@
+# built-in
+from argparse import ArgumentParser
+
+# app
+from ..config import builders
+from ..daemon import FORWARDED, get_socket_path, serve
+from .base import BaseCommand
+
+
+class SelfDaemonCommand(BaseCommand):
+    """Run dephell daemon to speed up next commands.
+    """
+    # because we don't actually use anything from the config
+    find_config = False
+
+    @staticmethod
+    def build_parser(parser) -> ArgumentParser:
+        builders.build_config(parser)
+        builders.build_output(parser)
+        builders.build_other(parser)
+        return parser
+
+    def __call__(self) -> bool:
+        self.logger.info('commands will be run in the daemon', extra=dict(commands=sorted(FORWARDED)))
+        try:
+            serve(path=get_socket_path())
+        except KeyboardInterrupt:
+            self.logger.info('daemon stopped')
+        return True
@@ -6,7 +6,7 @@ from dephell_argparse._parser import Parser
 from dephell_versioning import get_schemes
 
 # app
-from ..constants import FORMATS, LOG_FORMATTERS, LOG_LEVELS, REPOSITORIES, STRATEGIES
+from ..constants import CACHE_BACKENDS, FORMATS, LOG_FORMATTERS, LOG_LEVELS, REPOSITORIES, STRATEGIES
 
 
 # helper function for path values
@@ -58,6 +58,7 @@ def build_api(parser: Parser) -> None:
     api_group.add_argument('--warehouse', nargs='*', help='warehouse API URL.')
     api_group.add_argument('--bitbucket', help='bitbucket API URL.')
     api_group.add_argument('--repo', choices=REPOSITORIES, help='force repository for first-level deps.')
+    api_group.add_argument('--workers', type=int, help='how many threads parse downloaded archives.')
 
 
 def build_output(parser: Parser) -> None:
@@ -93,6 +94,7 @@ def build_other(parser: Parser) -> None:
 
     other_group.add_argument('--cache-path', help='path to dephell cache', type=expanded_path)
     other_group.add_argument('--cache-ttl', type=int, help='Time to live for releases list cache')
+    other_group.add_argument('--cache-backend', choices=CACHE_BACKENDS, help='storage for cache entries')
 
     other_group.add_argument('--project', help='path to the current project', type=expanded_path)
     other_group.add_argument('--bin', help='path to the dir for installing scripts', type=expanded_path)
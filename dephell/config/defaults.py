@@ -21,6 +21,7 @@ DEFAULT = dict(
     # api
     bitbucket='https://api.bitbucket.org/2.0',
     warehouse=[DEFAULT_WAREHOUSE],
+    workers=4,
 
     # output
     format='short',
@@ -50,6 +51,7 @@ DEFAULT = dict(
     cache=dict(
         path=str(get_cache_dir()),
         ttl=3600,
+        backend='files',
     ),
     bin=str(Path.home() / '.local' / 'bin'),
     project=str(Path('.').resolve()),
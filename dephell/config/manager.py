@@ -36,6 +36,14 @@ class Config:
     def __init__(self, data: Optional[dict] = None):
         self._data = data or deepcopy(DEFAULT)
 
+    def reset(self) -> None:
+        """Drop all attached values, recalculate defaults for the current directory.
+        """
+        self.env = ''
+        self._data = deepcopy(DEFAULT)
+        self._data['project'] = str(Path('.').resolve())
+        self._data['dotenv'] = str(Path('.').resolve())
+
     def setup_logging(self, data: Optional[Dict[str, Any]] = None) -> None:
         captureWarnings(True)
         if data is None:
@@ -114,9 +122,8 @@ class Config:
         if path.is_file() and not path.name.endswith(ARCHIVE_EXTENSIONS):
             with suppress(Exception):
                 content = path.read_text()
-        for name, converter in CONVERTERS.items():
-            if converter.can_parse(path=path, content=content):
-                return dict(format=name, path=text)
+        for name, _ in CONVERTERS.detect(path=path, content=content):
+            return dict(format=name, path=text)
 
         raise LookupError('cannot determine converter for file: ' + str(text))
 
@@ -2,7 +2,7 @@
 from dephell_versioning import get_schemes
 
 # app
-from ..constants import FORMATS, LOG_FORMATTERS, LOG_LEVELS, REPOSITORIES, STRATEGIES
+from ..constants import CACHE_BACKENDS, FORMATS, LOG_FORMATTERS, LOG_LEVELS, REPOSITORIES, STRATEGIES
 
 
 _TARGET = dict(
@@ -52,11 +52,13 @@ SCHEME = {
     'warehouse':    dict(type='list', schema=dict(type='string'), required=False, empty=True),
     'bitbucket':    dict(type='string', required=True),
     'repo':         dict(type='string', required=False, allowed=REPOSITORIES),
+    'workers':      dict(type='integer', required=True, min=0),
 
     # resolver
     'strategy':     dict(type='string', required=True, allowed=STRATEGIES),
     'prereleases':  dict(type='boolean', required=True),
     'mutations':    dict(type='integer', required=True),
+    'targets':      dict(type='list', schema=dict(type='string'), required=False, empty=False),
 
     # output
     'silent':       dict(type='boolean', required=True),
@@ -110,6 +112,7 @@ SCHEME = {
         schema={
             'path': dict(type='string', required=True),
             'ttl':  dict(type='integer', required=True),
+            'backend': dict(type='string', required=True, allowed=CACHE_BACKENDS),
         },
     ),
     'project':      dict(type='string', required=True),
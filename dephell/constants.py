@@ -69,6 +69,7 @@ PAIRS = (
 )
 
 STRATEGIES = ('min', 'max')
+CACHE_BACKENDS = ('files', 'sqlite')
 REPOSITORIES = ('pypi', 'conda', 'conda_git', 'conda_cloud')
 
 LOG_LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'EXCEPTION')
@@ -3,6 +3,7 @@ from ._conflict import analyze_conflict
 from ._dependency import DependencyMaker
 from ._docker import DockerContainer, DockerContainers
 from ._graph import Graph
+from ._memo import ResolutionMemo
 from ._mutator import Mutator
 from ._readme import Readme
 from ._repos import RepositoriesRegistry
@@ -20,6 +21,7 @@ __all__ = [
     'Mutator',
     'Readme',
     'RepositoriesRegistry',
+    'ResolutionMemo',
     'Resolver',
     'Safety',
     'SafetyVulnInfo',
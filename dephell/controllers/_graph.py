@@ -1,7 +1,8 @@
 # built-in
 from collections import ChainMap
+from itertools import count
 from logging import getLogger
-from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Set
 
 # app
 from ..imports import lazy_import
@@ -20,6 +21,8 @@ graphviz_backend = lazy_import('graphviz.backend')  # noqa: F811
 
 
 logger = getLogger(__name__)
+# mutable attributes of dependency that must be copied to restore it
+MUTABLE_FIELDS = ('constraint', 'marker', 'envs', 'inherited_envs', 'locations')
 
 
 class Layer:
@@ -48,10 +51,13 @@ class Layer:
 
         raise KeyError('Dependency already added in layer: ' + dep.name)
 
-    def clear(self) -> None:
-        for name, dep in self._mapping.copy().items():
-            if not dep.used:
-                del self._mapping[name]
+    def clear(self) -> List[str]:
+        """Drop not used deps and return their names.
+        """
+        names = [name for name, dep in self._mapping.items() if not dep.used]
+        for name in names:
+            del self._mapping[name]
+        return names
 
     def copy(self) -> 'Layer':
         return type(self)(self.level, *self._mapping.values())
@@ -79,6 +85,19 @@ class Layer:
 class Graph:
     conflict: Optional[Dependency] = None
     _layers: List[Layer]
+    # adjacency index: {name: names of deps that depend on it}
+    _parents: Dict[str, Set[str]]
+    # adjacency index: {name: names of its dependencies}
+    _children: Dict[str, Set[str]]
+    # level of the layer and adding order for every dep in the graph
+    _levels: Dict[str, int]
+    _order: Dict[str, int]
+    # names of deps that can be not applied, checked by `get_leafs`
+    _dirty: Set[str]
+    _deps_cache: Optional[tuple] = None
+    # changes since the checkpoint to roll them back, None if changes aren't recorded
+    _journal: Optional[List[tuple]] = None
+    _touched: Set[str]
 
     def __init__(self, *roots: RootDependency) -> None:
         for root in roots:
@@ -92,47 +111,153 @@ class Graph:
         self._layers = [Layer(0, *self._roots)]
         self._deps = ChainMap(*[layer._mapping for layer in self._layers])
         self.conflict = None
+        self._parents = dict()
+        self._children = dict()
+        self._levels = dict()
+        self._order = dict()
+        self._counter = count()
+        self._dirty = set()
+        self._deps_cache = None
+        self._journal = None
+        self._touched = set()
+        for root in self._roots:
+            self._register(root, level=0)
 
     def clear(self) -> None:
         """Drop from graph all deps that isn't required for roots.
         """
         for layer in self._layers[1:]:
-            layer.clear()
+            for name in layer.clear():
+                self._forget(name)
 
     def add(self, dep, *, level: Optional[int] = None) -> None:
         if isinstance(dep, RootDependency):
             self._layers[0].add(dep)
             self._roots.append(dep)
+            self._register(dep, level=0)
             return
 
-        if level is not None:
-            if level < len(self._layers):
-                self._layers[level].add(dep)
-            else:
-                layer = Layer(level, dep)
-                self._layers.append(layer)
-                self._deps = self._deps.new_child(layer._mapping)
+        if level is None:
+            levels = [self._levels[name] for name in dep.constraint.sources if name in self._levels]
+            if not levels:
+                raise KeyError('cannot find any parent for dependency: ' + str(dep.name))
+            level = min(levels) + 1
+
+        created = level >= len(self._layers)
+        merged = not created and dep.name in self._layers[level]
+        if merged:
+            self.touch(self._layers[level].get(dep.name))
+        if created:
+            layer = Layer(level, dep)
+            self._layers.append(layer)
+            self._deps = self._deps.new_child(layer._mapping)
+        else:
+            self._layers[level].add(dep)
+        if not merged and self._journal is not None:
+            self._journal.append(('add', dep.name, level, created))
+        self._register(dep, level=level)
+
+    def connect(self, parent, children: Iterable) -> None:
+        """Remember dependencies of the parent, replacing previously known ones.
+        """
+        name = parent.name
+        for child in self._children.pop(name, ()):
+            self._parents[child].discard(name)
+        names = {child.name for child in children}
+        self._children[name] = names
+        for child in names:
+            self._parents.setdefault(child, set()).add(name)
+
+    def checkpoint(self) -> None:
+        """Start recording changes of the graph to roll them back later.
+        """
+        self._journal = []
+        self._touched = set()
+
+    def commit(self) -> None:
+        """Stop recording changes and keep them.
+        """
+        self._journal = None
+
+    def rollback(self) -> None:
+        """Undo all changes since the checkpoint and stop recording.
+        """
+        if self._journal is None:
+            raise ValueError('no checkpoint to rollback')
+        journal, self._journal = self._journal, None
+        for entry in reversed(journal):
+            if entry[0] == 'add':
+                _, name, level, created = entry
+                del self._layers[level][name]
+                self._forget(name)
+                if created:
+                    self._layers.pop()
+                    self._deps = self._deps.parents
+                continue
+            _, dep, state = entry
+            dep.__dict__.clear()
+            dep.__dict__.update(state)
+            if 'groups' in state:
+                dep.groups.actualize()
+            self.mark(dep)
+
+    def touch(self, dep) -> None:
+        """Remember state of the dep before changing it if changes are recorded.
+        """
+        if self._journal is None or dep.name in self._touched:
             return
+        self._touched.add(dep.name)
+        state = dict(dep.__dict__)
+        for name in MUTABLE_FIELDS:
+            if state.get(name) is not None:
+                state[name] = state[name].copy()
+        self._journal.append(('touch', dep, state))
+
+    def mark(self, dep) -> None:
+        """Mark dep as possibly not applied to be checked by `get_leafs`.
 
-        parents_names = dep.constraint.sources
-        for layer in self._layers:
-            for parent in layer:
-                if parent.name in parents_names:
-                    return self.add(dep, level=layer.level + 1)
-        raise KeyError('cannot find any parent for dependency: ' + str(dep.name))
+        Call it when dep becomes not applied or gets a new constraint.
+        """
+        self._dirty.add(dep.name)
+
+    def _register(self, dep, level: int) -> None:
+        if dep.name not in self._order:
+            self._order[dep.name] = next(self._counter)
+            self._levels[dep.name] = level
+            self._deps_cache = None
+        self._dirty.add(dep.name)
+
+    def _forget(self, name: str) -> None:
+        for parent in self._parents.pop(name, ()):
+            self._children.get(parent, set()).discard(name)
+        for child in self._children.pop(name, ()):
+            self._parents.get(child, set()).discard(name)
+        self._levels.pop(name, None)
+        self._order.pop(name, None)
+        self._dirty.discard(name)
+        self._deps_cache = None
+
+    def _sort(self, names) -> List[str]:
+        """Sort names of deps in the graph by layer and adding order, like deps in the layers.
+        """
+        names = [name for name in names if name in self._levels]
+        return sorted(names, key=lambda name: (self._levels[name], self._order[name]))
 
     def get_leafs(self, level: Optional[int] = None) -> tuple:
         """Get deps that aren't applied yet
-        """
-        layers = self._layers
-        if level is not None:
-            layers = layers[:level + 1]
 
+        Only marked deps are checked. Applied and not used deps are unmarked,
+        they will be marked again when unapplied or constrained.
+        """
         result = []
-        for layer in layers:
-            for dep in layer:
-                if not dep.applied and dep.used:
-                    result.append(dep)
+        for name in self._sort(self._dirty):
+            if level is not None and self._levels[name] > level:
+                continue
+            dep = self.get(name)
+            if dep.applied or not dep.used:
+                self._dirty.discard(name)
+                continue
+            result.append(dep)
         return tuple(result)
 
     def get_layer(self, dep_or_level) -> Layer:
@@ -157,45 +282,39 @@ class Graph:
     def get_children(self, dep) -> dict:
         """Get all children of dependency that already represented in graph.
         """
-        if not dep.locked:
-            return dict()
-        result = dict()
-        for child in dep.dependencies:
-            layer = self.get_layer(child)
-            if layer is None:
-                continue
-            if child.name in result:
-                logger.warning('Recursive dependency: {dep}', extra=dict(dep=child.name))
-            else:
-                result[child.name] = self.get(name=child.name)
-            result.update(self.get_children(child))
-        return result
+        return self._walk(self._children, [dep])
 
-    def get_parents(self, *deps, avoid: Optional[list] = None) -> dict:
-        if avoid is None:
-            avoid = []
+    def get_parents(self, *deps) -> dict:
+        """Get all ancestors of dependencies, the closest first.
 
-        parents = dict()
+        Sources of constraints are parents too, so it works
+        for copies of deps (like the conflict).
+        """
+        sources = set()
         for dep in deps:
-            for layer in self._layers:
-                for parent in layer:
-                    was_locked = parent.locked
-                    for children in parent.dependencies:
-                        if children.name != dep.name:
-                            continue
-                        if children.name in avoid:
-                            continue
-                        parents[parent.name] = parent
-                        break
-                    # if dependency hasn't been locked then unlock it after our accidental lock
-                    if parent.locked and not was_locked:
-                        parent.unlock()
-        if parents:
-            parents.update(self.get_parents(
-                *parents.values(),
-                avoid=avoid + [dep.name for dep in deps],
-            ))
-        return parents
+            sources.update(dep.constraint.sources)
+        return self._walk(self._parents, deps, found=sources)
+
+    def _walk(self, index: Dict[str, Set[str]], deps, found: Iterable[str] = ()) -> dict:
+        result: Dict[str, Any] = dict()
+        # the given deps can be in the result on cycles, but aren't visited twice
+        visited = {dep.name for dep in deps}
+        names = list(visited)
+        found = set(found)
+        while names:
+            for name in names:
+                found.update(index.get(name, ()))
+            names = []
+            for name in self._sort(found - result.keys()):
+                dep = self.get(name)
+                if dep is None:
+                    continue
+                result[name] = dep
+                if name not in visited:
+                    names.append(name)
+            visited.update(names)
+            found = set()
+        return result
 
     def fast_apply(self) -> bool:
         """Apply only the first layer.
@@ -203,6 +322,7 @@ class Graph:
         if len(self._layers) != 1:
             return False
         for root in self._roots:
+            self.connect(root, root.dependencies)
             for dep in root.dependencies:
                 dep.applied = True
                 self.add(dep)
@@ -248,11 +368,13 @@ class Graph:
 
     @property
     def names(self) -> set:
-        return set(self._deps.keys())
+        return set(self._levels)
 
     @property
     def deps(self) -> tuple:
-        return tuple(dep for dep in self._deps.values() if dep not in self._roots)
+        if self._deps_cache is None:
+            self._deps_cache = tuple(dep for layer in self._layers[1:] for dep in layer)
+        return self._deps_cache
 
     @property
     def applied(self) -> bool:
@@ -269,8 +391,10 @@ class Graph:
 
     def __contains__(self, dep) -> bool:
         if isinstance(dep, str):
-            return dep in self.names
-        return dep in self.deps
+            return dep in self._levels
+        if isinstance(dep, RootDependency):
+            return False
+        return self.get(dep.name) is dep
 
     def __repr__(self):
         roots = [str(root) for root in self._roots]
@@ -0,0 +1,100 @@
+# built-in
+import json
+from hashlib import sha256
+from logging import getLogger
+from typing import TYPE_CHECKING, Iterable, Optional
+
+# external
+import attr
+
+# app
+from ..cache import JSONCache
+from ..cached_property import cached_property
+from ..config import config
+
+
+if TYPE_CHECKING:
+    # app
+    from ._graph import Graph
+    from ._resolver import Resolver
+
+
+logger = getLogger('dephell.controllers.memo')
+
+
+def get_fingerprint(releases: Iterable) -> str:
+    """Hash of the releases list to detect new (or removed) releases of a package.
+    """
+    versions = sorted(str(release.version) for release in releases)
+    return sha256('|'.join(versions).encode()).hexdigest()
+
+
+def _get_repos(repo) -> list:
+    return [[type(repo).__name__, getattr(repo, 'url', '')] for repo in getattr(repo, 'repos', [repo])]
+
+
+@attr.s()
+class ResolutionMemo:
+    """Results of resolution keyed by the root dependencies, resolver config and repositories.
+
+    The memo stores chosen versions for all packages in the resolved graph
+    and fingerprints of their releases lists.
+    """
+    key = attr.ib(type=str)
+
+    @classmethod
+    def from_graph(cls, graph: 'Graph') -> Optional['ResolutionMemo']:
+        """Get memo for the not resolved graph. Returns None if the graph can't be memoized.
+        """
+        roots = []
+        for root in graph.get_layer(0):
+            deps = []
+            for dep in root.dependencies:
+                # VCS and local dependencies can be changed without changing of releases list
+                if dep.link is not None:
+                    return None
+                deps.append([str(dep), sorted(dep.envs), _get_repos(dep.repo)])
+            roots.append([root.name, str(root.python), sorted(deps)])
+
+        content = json.dumps(dict(
+            roots=sorted(roots),
+            strategy=config['strategy'],
+            prereleases=config['prereleases'],
+        ), sort_keys=True)
+        return cls(key=sha256(content.encode()).hexdigest())
+
+    @cached_property
+    def cache(self) -> JSONCache:
+        return JSONCache('resolutions', self.key)
+
+    def restore(self, resolver: 'Resolver') -> bool:
+        """Pin versions in the resolver from the memo.
+        """
+        data = self.cache.load()
+        if not data:
+            return False
+        logger.debug('resolution memo found', extra=dict(key=self.key, pins=len(data['pins'])))
+        resolver.pins = data['pins']
+        resolver.pins_fingerprints = data['fingerprints']
+        return True
+
+    def save(self, resolver: 'Resolver') -> None:
+        """Save versions from the resolved graph.
+
+        Nothing is saved if any dependency in the graph has a link.
+        """
+        pins = dict()
+        fingerprints = dict()
+        for dep in resolver.graph:
+            # VCS and local dependencies can be changed without changing of releases list
+            if dep.link is not None:
+                logger.debug('resolution is not memoized', extra=dict(dep=dep.name, link=str(dep.link)))
+                return
+            if not dep.locked:
+                continue
+            pins[dep.name] = str(dep.group.best_release.version)
+            fingerprint = resolver.fingerprints.get(dep.name)
+            if fingerprint is None:
+                fingerprint = get_fingerprint(dep.groups.releases)
+            fingerprints[dep.name] = fingerprint
+        self.cache.dump(dict(pins=pins, fingerprints=fingerprints))
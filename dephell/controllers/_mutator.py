@@ -1,7 +1,7 @@
 # built-in
 from itertools import product
 from logging import getLogger
-from typing import Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from typing import FrozenSet, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
 # external
 import attr
@@ -43,7 +43,12 @@ def lazy_product(*all_groups) -> Iterator:
 class Mutator:
     limit = attr.ib(type=int, factory=lambda: config['mutations'])
     mutations = attr.ib(type=int, default=0, init=False)
+    pruned = attr.ib(type=int, default=0, init=False)
     _snapshots = attr.ib(type=Set[Tuple[str, ...]], factory=set, repr=False, init=False)
+    # minimal sets of (package name, group number) that can't be chosen together
+    _incompatibilities = attr.ib(
+        type=Set[FrozenSet[Tuple[str, int]]], factory=set, repr=False, init=False,
+    )
 
     def mutate(self, graph: Graph) -> Optional[Tuple[Group, ...]]:
         """Get graph with conflict and mutate one dependency.
@@ -85,9 +90,32 @@ class Mutator:
 
     def _check_soft(self, groups: Sequence[Group], deps: Sequence[Dependency],
                     conflict: Dependency) -> bool:
-        """True if that mutation wasn't tried before
+        """True if that mutation wasn't tried before and has no known incompatibilities
         """
-        return self._make_snapshot(groups) not in self._snapshots
+        if self._make_snapshot(groups) in self._snapshots:
+            return False
+        if self._incompatibilities:
+            assignment = self._get_assignment(groups=groups, deps=deps)
+            for incompatibility in self._incompatibilities:
+                if incompatibility <= assignment:
+                    self.pruned += 1
+                    return False
+        return True
+
+    @staticmethod
+    def _get_assignment(groups: Sequence[Group], deps: Sequence[Dependency]) -> Set[Tuple[str, int]]:
+        """Groups that will be certainly chosen after the mutation.
+
+        Not changed (and not chosen yet) groups aren't included: they can be
+        unlocked and chosen again after unapplying of their mutated parents.
+        """
+        assignment = set()
+        for group, dep in zip(groups, deps):
+            if isinstance(dep, RootDependency):
+                assignment.add((dep.name, group.number))
+            elif dep.locked and dep.group.number != group.number:
+                assignment.add((dep.name, group.number))
+        return assignment
 
     def _check_not_empty(self, groups: Sequence[Group], deps: Sequence[Dependency],
                          conflict: Dependency) -> bool:
@@ -150,3 +178,36 @@ class Mutator:
         """Remember given mutation to not repeat it in the future.
         """
         self._snapshots.add(self._make_snapshot(groups))
+
+    def learn(self, conflict: Dependency) -> None:
+        """Remember the minimal set of parents groups that makes the dependency incompatible.
+
+        It works only when none of the dependency releases fits the constraint,
+        so the conflict doesn't depend on the chosen group of the dependency.
+        """
+        releases = conflict.groups.releases
+        specs = conflict.constraint._specs
+        groups = conflict.constraint._groups
+        if self._any_fits(releases, specs.values()):
+            return
+
+        # greedy deletion: drop every source that isn't required for the conflict
+        names = sorted(specs)
+        for name in names[:]:
+            rest = [specs[other] for other in names if other != name]
+            if not self._any_fits(releases, rest):
+                names.remove(name)
+        incompatibility = frozenset((name, groups[name]) for name in names)
+        logger.debug('learned incompatibility', extra=dict(
+            dep=conflict.name,
+            groups=sorted(incompatibility),
+        ))
+        self._incompatibilities.add(incompatibility)
+
+    @staticmethod
+    def _any_fits(releases, specs) -> bool:
+        specs = list(specs)
+        for release in releases:
+            if all(release in spec for spec in specs):
+                return True
+        return False
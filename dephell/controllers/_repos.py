@@ -1,5 +1,4 @@
 # built-in
-from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Set, Type, Union
 from urllib.parse import urljoin, urlparse
@@ -10,6 +9,7 @@ import requests
 from requests.exceptions import ConnectionError, SSLError
 
 # app
+from ..cache import memo
 from ..config import config as global_config
 from ..constants import WAREHOUSE_DOMAINS
 from ..exceptions import PackageNotFoundError
@@ -17,10 +17,17 @@ from ..models import Auth
 from ..repositories import WarehouseAPIRepo, WarehouseBaseRepo, WarehouseLocalRepo, WarehouseSimpleRepo
 
 
-@lru_cache(maxsize=16)
 def _has_api(url: str) -> bool:
     if urlparse(url).hostname in ('pypi.org', 'python.org', 'test.pypi.org'):
         return True
+    result = memo.get('has-api', url)
+    if result is None:
+        result = _check_api(url=url)
+        memo.set('has-api', url, result)
+    return result
+
+
+def _check_api(url: str) -> bool:
     full_url = urljoin(url, 'dephell/json/')
     try:
         response = requests.head(full_url)
@@ -1,16 +1,21 @@
 # built-in
+import asyncio
 import re
 from logging import getLogger
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterable, Optional, Set
 
 # external
+from aiohttp import ClientError
 from packaging.markers import Marker
 from yaspin import yaspin
 
 # app
+from ..cache import batch
 from ..context_tools import nullcontext
-from ..models import RootDependency
+from ..models import RootDependency, Target
+from ..networking import retry_policy
 from ._conflict import analyze_conflict
+from ._memo import ResolutionMemo, get_fingerprint
 
 
 if TYPE_CHECKING:
@@ -20,29 +25,59 @@ if TYPE_CHECKING:
 
 
 logger = getLogger('dephell.resolver')
+loop = asyncio.get_event_loop()
 REX_BASE_VERSION = re.compile(r'[0-9\.]+')
+# How many packages can fetch dependencies at the same time on prefetching.
+PREFETCH_LIMIT = 32
+# network and parsing errors that can be raised on fetching releases and dependencies
+PREFETCH_ERRORS = (OSError, ValueError, LookupError, ClientError, asyncio.TimeoutError)
+
+
+class StalePinsError(Exception):
+    """Releases list of pinned package was changed since pins were made.
+    """
 
 
 class Resolver:
     def __init__(self, graph: 'Graph', mutator: 'Mutator') -> None:
         self.graph = graph
         self.mutator = mutator
+        # versions that must be chosen for packages if possible: {name: version}
+        self.pins: Dict[str, str] = dict()
+        # expected fingerprints of releases lists for pinned packages
+        self.pins_fingerprints: Dict[str, str] = dict()
+        # fingerprints of releases lists for pinned packages
+        self.fingerprints: Dict[str, str] = dict()
+        # packages that are resolved without pins together with all their dependencies
+        self.unpinned: Set[str] = set()
 
     def apply(self, parent, recursive: bool = False):
         """
         Returns conflicting (incompatible) dependency.
         """
-        for new_dep in parent.dependencies:
+        self.graph.touch(parent)
+        deps = parent.dependencies
+        self.graph.connect(parent, deps)
+        unpin = parent.name in self.unpinned
+        for new_dep in deps:
+            if unpin:
+                self.unpinned.add(new_dep.name)
             other_dep = self.graph.get(new_dep.name)
             if other_dep is None:
                 # add new dep to graph
                 other_dep = new_dep.copy()
+                if other_dep.name in self.pins and not unpin:
+                    self._pin(other_dep)
                 self.graph.add(other_dep)
             elif isinstance(other_dep, RootDependency):
                 # if some of the dependencies cyclicaly depends on root
                 # then ignore these deps
                 continue
             else:
+                self.graph.touch(other_dep)
+                # pinned dep is reached from an unpinned package, resolve it again
+                if unpin and other_dep.name in self.pins:
+                    self.unpin(other_dep)
                 # if dep is locked, but not used, let's just unlock it
                 if other_dep.locked and not other_dep.used:
                     other_dep.unlock()
@@ -51,6 +86,7 @@ class Resolver:
                     other_dep += new_dep
                 except TypeError:   # conflict happened
                     return other_dep
+                self.graph.mark(other_dep)
                 # `recursive` used only in re-application of dependencies,
                 # when the graph already was built before.
                 if recursive:
@@ -67,37 +103,91 @@ class Resolver:
         """
         if not force and not dep.applied:
             return
-        # it must be before actual unapplying to avoid recursion on circular dependencies
         if not soft:
             dep.applied = False
+            self.graph.mark(dep)
+
+        # iterative depth-first traversal: deep graphs can hit the recursion limit
+        visited = {dep.name}
+        stack = [(dep, iter(dep.dependencies))]
+        while stack:
+            parent, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                if not soft and parent.locked:
+                    parent.unlock()
+                continue
 
-        for child in dep.dependencies:
             child_name = child.name
             child = self.graph.get(child_name)
             if child is None:
-                logger.debug('child not found', extra=dict(dep=dep.name, child=child_name))
+                logger.debug('child not found', extra=dict(dep=parent.name, child=child_name))
                 continue
             # unapply current dependency for child
-            child.unapply(dep.name)
+            child.unapply(parent.name)
             # unapply child because he is modified
-            self.unapply(child, force=False, soft=soft)
+            if not child.applied or child.name in visited:
+                continue
+            visited.add(child.name)
+            if not soft:
+                child.applied = False
+                self.graph.mark(child)
+            stack.append((child, iter(child.dependencies)))
 
-        if not soft and dep.locked:
-            dep.unlock()
+    def resolve(self, debug: bool = False, silent: bool = False, level: Optional[int] = None,
+                memo: bool = False) -> bool:
+        """Resolve the graph.
+
+        memo -- reuse versions from the previous resolution of the same graph.
+        """
+        resolution_memo = None  # type: Optional[ResolutionMemo]
+        if memo and level is None and len(self.graph._layers) == 1:
+            resolution_memo = ResolutionMemo.from_graph(self.graph)
+        if resolution_memo is not None:
+            resolution_memo.restore(self)
 
-    def resolve(self, debug: bool = False, silent: bool = False, level: Optional[int] = None) -> bool:
         if silent:
             spinner = nullcontext(type('Mock', (), {}))
         else:
             spinner = yaspin(text='resolving...')
 
         with spinner as spinner:
-            while True:
-                resolved = self._resolve(debug=debug, silent=silent, level=level, spinner=spinner)
-                if resolved is None:
-                    continue
-                self.graph.clear()  # remove unused deps from graph
-                return resolved
+            try:
+                resolved = self._resolve_all(debug=debug, silent=silent, level=level, spinner=spinner)
+            except StalePinsError as e:
+                logger.debug('releases of pinned package were changed', extra=dict(dep=e.args[0]))
+                resolved = False
+            # pinned versions can be incompatible, let's try without them
+            if not resolved and self.pins:
+                logger.debug('cannot resolve with pins, resolving from scratch')
+                self.reset()
+                resolved = self._resolve_all(debug=debug, silent=silent, level=level, spinner=spinner)
+
+        if resolved and resolution_memo is not None:
+            resolution_memo.save(self)
+        retry_policy.report()
+        return resolved
+
+    def reset(self) -> None:
+        """Drop all pins and all resolved deps from the graph.
+        """
+        self.pins = dict()
+        self.pins_fingerprints = dict()
+        self.fingerprints = dict()
+        self.unpinned = set()
+        self.graph.reset()
+        for root in self.graph.get_layer(0):
+            root.applied = False
+        self.mutator = type(self.mutator)(limit=self.mutator.limit)
+
+    def _resolve_all(self, debug: bool, silent: bool, level: Optional[int], spinner) -> bool:
+        while True:
+            resolved = self._resolve(debug=debug, silent=silent, level=level, spinner=spinner)
+            if resolved is None:
+                continue
+            self.graph.clear()  # remove unused deps from graph
+            return resolved
 
     def _resolve(self, debug: bool, silent: bool, level: Optional[int], spinner) -> Optional[bool]:
         if silent:
@@ -116,6 +206,9 @@ class Resolver:
         if not deps:
             return True
 
+        # fetch dependencies for the whole layer at once
+        self.prefetch(deps)
+
         # check python version
         for dep in deps:
             if not dep.python_compat:
@@ -144,6 +237,47 @@ class Resolver:
                 dep.group = group
         return None
 
+    def prefetch(self, deps: Iterable) -> None:
+        """Concurrently fetch dependencies of best releases for all given deps.
+
+        It's the best effort: network and parsing errors are ignored here
+        to be raised later by the resolver when it accesses the dependencies.
+        """
+        groups = []
+        for dep in deps:
+            if isinstance(dep, RootDependency) or dep.locked:
+                continue
+            # releases are fetched synchronously, so let's do it before gathering
+            try:
+                dep.groups.releases
+            except PREFETCH_ERRORS:
+                logger.debug('cannot prefetch releases', extra=dict(dep=dep.name), exc_info=True)
+                continue
+            groups.append(dep.groups)
+        if not groups:
+            return
+
+        async def bounded(semaphore, groups):
+            async with semaphore:
+                await groups.prefetch()
+
+        async def gather():
+            semaphore = asyncio.Semaphore(PREFETCH_LIMIT)
+            tasks = [bounded(semaphore, subgroups) for subgroups in groups]
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+        with batch():
+            results = loop.run_until_complete(gather())
+        for subgroups, result in zip(groups, results):
+            if not isinstance(result, BaseException):
+                continue
+            if not isinstance(result, PREFETCH_ERRORS):
+                raise result
+            logger.debug('cannot prefetch dependencies', extra=dict(
+                dep=subgroups.dep.name,
+                error=repr(result),
+            ))
+
     def apply_envs(self, envs: set, deep: bool = True) -> None:
         """Filter out dependencies from the graph by the given envs.
 
@@ -171,6 +305,7 @@ class Resolver:
             if deep:
                 self.unapply(dep, soft=True)
             dep.applied = False
+            self.graph.mark(dep)
 
         # Some child deps can be unapplied from other child deps, but we need them.
         # For example, if we need A, but don't need B, and A and B depends on C,
@@ -212,11 +347,105 @@ class Resolver:
 
             self.unapply(dep, soft=True)
             dep.applied = False
+            self.graph.mark(dep)
+
+    def get_targets(self, targets: Iterable[Target]) -> Dict[str, FrozenSet[str]]:
+        """Get names of targets for which every applied dependency is needed.
+
+        Dependency is needed for a target if it is needed for one of its parents
+        and the marker from this parent matches the target.
+        Every marker is parsed once and evaluated for all targets at once.
+        """
+        targets = list(targets)
+        everywhere = frozenset(target.name for target in targets)
+        envs = [(target.name, target.environment) for target in targets]
+        matched = dict()  # type: Dict[str, FrozenSet[str]]
+
+        def match(marker) -> FrozenSet[str]:
+            key = str(marker or '')
+            if not key:
+                return everywhere
+            if key not in matched:
+                parsed = Marker(key)
+                matched[key] = frozenset(name for name, env in envs if parsed.evaluate(env))
+            return matched[key]
+
+        result = {root.name: everywhere for root in self.graph.get_layer(0)}
+        deps = [dep for dep in self.graph if dep.applied]
+        # repeat until nothing is changed to pass targets through cycles
+        changed = True
+        while changed:
+            changed = False
+            for dep in deps:
+                found = result.get(dep.name, frozenset())
+                for source in dep.constraint.sources:
+                    parent = result.get(source)
+                    if parent:
+                        found |= parent & match(dep.marker.get(source))
+                if found != result.get(dep.name, frozenset()):
+                    result[dep.name] = found
+                    changed = True
+        return result
+
+    def apply_targets(self, targets: Iterable[Target]) -> Dict[str, FrozenSet[str]]:
+        """Drop dependencies not needed for any target and annotate the rest.
+
+        Markers of dependencies needed only for some targets are restricted to these targets.
+        """
+        targets = list(targets)
+        everywhere = frozenset(target.name for target in targets)
+        markers = {target.name: target.marker for target in targets}
+        matrix = self.get_targets(targets)
+        for dep in self.graph:
+            if not dep.applied:
+                continue
+            names = matrix.get(dep.name)
+            if not names:
+                self.unapply(dep, soft=True)
+                dep.applied = False
+                self.graph.mark(dep)
+                continue
+            if names != everywhere:
+                dep.marker.restrict(' or '.join('({})'.format(markers[name]) for name in sorted(names)))
+        return matrix
+
+    def _pin(self, dep) -> None:
+        """Restrict releases of the dependency by the pinned version.
+        """
+        releases = dep.groups.releases
+        fingerprint = get_fingerprint(releases)
+        expected = self.pins_fingerprints.get(dep.name)
+        if expected is not None and expected != fingerprint:
+            raise StalePinsError(dep.name)
+        self.fingerprints[dep.name] = fingerprint
+
+        version = self.pins[dep.name]
+        for release in releases:
+            if str(release.version) == version:
+                break
+        else:
+            logger.debug('pinned release not found', extra=dict(dep=dep.name, version=version))
+            return
+        groups = type(dep.groups)(dep=dep, extra=dep.groups.extra)
+        groups.__dict__['releases'] = [release]
+        dep.groups = groups
+
+    def unpin(self, dep) -> None:
+        """Drop the pinned version of the dependency from the graph.
+
+        The dependency and its children are unapplied,
+        so the resolver chooses the version for them again.
+        """
+        del self.pins[dep.name]
+        self.unapply(dep)
+        dep.groups = type(dep.groups)(dep=dep, extra=dep.groups.extra)
 
     def _apply_deps(self, deps, debug: bool = False) -> bool:
         for dep in deps:
+            self.graph.checkpoint()
             conflict = self.apply(dep)
             if conflict is None:
+                self.graph.commit()
                 continue
 
             logger.debug('conflict', extra=dict(
@@ -224,6 +453,7 @@ class Resolver:
                 constraint=conflict.constraint,
             ))
             self.graph.conflict = conflict.copy()
+            self.mutator.learn(conflict)
 
             if debug:
                 print(analyze_conflict(
@@ -232,7 +462,7 @@ class Resolver:
                 ))
 
             # Dep can be partialy applied. Clean it.
-            self.unapply(dep)
+            self.graph.rollback()
             return False
 
         # only if all deps applied
@@ -1,22 +1,9 @@
 # built-in
-from typing import Dict
+import sys
+from importlib import import_module
 
 # app
-from .base import BaseConverter
-from .conda import CondaConverter
-from .egginfo import EggInfoConverter
-from .flit import FlitConverter
-from .imports import ImportsConverter
-from .installed import InstalledConverter
-from .pip import PIPConverter
-from .pipfile import PIPFileConverter
-from .pipfilelock import PIPFileLockConverter
-from .poetry import PoetryConverter
-from .poetrylock import PoetryLockConverter
-from .pyproject import PyProjectConverter
-from .sdist import SDistConverter
-from .setuppy import SetupPyConverter
-from .wheel import WheelConverter
+from .registry import CONVERTERS, INFOS
 
 
 __all__ = [
@@ -39,32 +26,18 @@ __all__ = [
     'WheelConverter',
 ]
 
+# allow to import converters, modules of converters are imported on the first access
+_MODULES = {info.name: info.module for info in INFOS.values()}
+_MODULES['BaseConverter'] = 'base'
 
-CONVERTERS = dict(
-    # archives
-    egginfo=EggInfoConverter(),
-    sdist=SDistConverter(),
-    wheel=WheelConverter(),
 
-    # pip
-    pip=PIPConverter(lock=False),
-    piplock=PIPConverter(lock=True),
+def __getattr__(name: str):
+    if name in _MODULES:
+        module = import_module('.' + _MODULES[name], package=__name__)
+        return getattr(module, name)
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
 
-    # pipenv
-    pipfile=PIPFileConverter(),
-    pipfilelock=PIPFileLockConverter(),
 
-    # poetry
-    poetry=PoetryConverter(),
-    poetrylock=PoetryLockConverter(),
-
-    # environment
-    imports=ImportsConverter(),
-    installed=InstalledConverter(),
-
-    # other
-    conda=CondaConverter(),
-    flit=FlitConverter(),
-    pyproject=PyProjectConverter(),
-    setuppy=SetupPyConverter(),
-)  # type: Dict[str, BaseConverter]
+# module-level __getattr__ is supported only since python 3.7
+if sys.version_info < (3, 7):
+    locals().update({name: __getattr__(name) for name in _MODULES})
@@ -0,0 +1,151 @@
+# built-in
+from collections.abc import Mapping
+from fnmatch import fnmatch
+from importlib import import_module
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, Tuple
+
+# external
+import attr
+
+
+if TYPE_CHECKING:
+    # app
+    from .base import BaseConverter
+
+
+@attr.s(frozen=True)
+class ConverterInfo:
+    """How to make the converter and which files it can parse.
+
+    Files and markers are only hints to skip converters without importing them,
+    the converter's `can_parse` makes the final decision.
+    """
+    module = attr.ib(type=str)
+    name = attr.ib(type=str)                # class name
+    params = attr.ib(type=dict, factory=dict)
+
+    files = attr.ib(type=Tuple[str, ...], default=())      # patterns for file names
+    markers = attr.ib(type=Tuple[str, ...], default=())    # substrings of file content
+    dirs = attr.ib(type=bool, default=False)                # can parse any directory
+
+    def match(self, path: Path, content: Optional[str] = None) -> bool:
+        if any(fnmatch(path.name, pattern) for pattern in self.files):
+            return True
+        if content and any(marker in content for marker in self.markers):
+            return True
+        return self.dirs and path.is_dir()
+
+
+INFOS = dict(
+    # archives
+    egginfo=ConverterInfo(
+        module='egginfo', name='EggInfoConverter',
+        files=('*.egg-info', 'requires.txt', 'PKG-INFO'),
+    ),
+    sdist=ConverterInfo(
+        module='sdist', name='SDistConverter',
+        files=('dist', '*.zip', '*.gz', '*.tar'),
+    ),
+    wheel=ConverterInfo(
+        module='wheel', name='WheelConverter',
+        files=('dist', 'METADATA', '*.whl', '*.zip'), dirs=True,
+    ),
+
+    # pip
+    pip=ConverterInfo(
+        module='pip', name='PIPConverter', params=dict(lock=False),
+        files=('requirements.in', 'requirements*.txt'),
+    ),
+    piplock=ConverterInfo(
+        module='pip', name='PIPConverter', params=dict(lock=True),
+        files=('requirements.lock', 'requirements.txt'),
+    ),
+
+    # pipenv
+    pipfile=ConverterInfo(
+        module='pipfile', name='PIPFileConverter',
+        files=('Pipfile', ), markers=('[packages]', ),
+    ),
+    pipfilelock=ConverterInfo(
+        module='pipfilelock', name='PIPFileLockConverter',
+        files=('Pipfile.lock', ), markers=('pipfile-spec', ),
+    ),
+
+    # poetry
+    poetry=ConverterInfo(
+        module='poetry', name='PoetryConverter',
+        files=('poetry.toml', 'pyproject.toml'), markers=('[tool.poetry', ),
+    ),
+    poetrylock=ConverterInfo(
+        module='poetrylock', name='PoetryLockConverter',
+        files=('pyproject.lock', 'poetry.lock'), markers=('[[package]]', ),
+    ),
+
+    # environment
+    imports=ConverterInfo(module='imports', name='ImportsConverter', files=('*.py', ), dirs=True),
+    installed=ConverterInfo(module='installed', name='InstalledConverter'),
+
+    # other
+    conda=ConverterInfo(
+        module='conda', name='CondaConverter',
+        files=('environment.yml', 'environment.yaml'),
+    ),
+    flit=ConverterInfo(module='flit', name='FlitConverter', markers=('[tool.flit.metadata]', )),
+    pyproject=ConverterInfo(
+        module='pyproject', name='PyProjectConverter',
+        files=('pyproject.toml', ), markers=('[build-system]', ),
+    ),
+    setuppy=ConverterInfo(
+        module='setuppy', name='SetupPyConverter',
+        files=('setup.py', ), markers=('setup(', ),
+    ),
+)
+
+
+class _Converters(Mapping):
+    """Converters by formats. Module of a converter is imported on the first access.
+    """
+    def __init__(self, infos: Dict[str, ConverterInfo], package: str) -> None:
+        self._infos = infos
+        self._package = package
+        self._loaded = dict()  # type: Dict[str, BaseConverter]
+
+    def get_class(self, name: str) -> type:
+        info = self._infos[name]
+        module = import_module('.' + info.module, package=self._package)
+        return getattr(module, info.name)
+
+    def detect(self, path: Path, content: Optional[str] = None) -> Iterator[Tuple[str, 'BaseConverter']]:
+        """Get formats and converters that can parse the file.
+
+        Only converters that can match the file by the table are imported.
+        """
+        for name, info in self._infos.items():
+            if not info.match(path=path, content=content):
+                continue
+            converter = self[name]
+            if converter.can_parse(path=path, content=content):
+                yield name, converter
+
+    def __getitem__(self, name: str) -> 'BaseConverter':
+        converter = self._loaded.get(name)
+        if converter is not None:
+            return converter
+        if name not in self._infos:
+            raise KeyError(name)
+        converter = self.get_class(name)(**self._infos[name].params)
+        self._loaded[name] = converter
+        return converter
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._infos)
+
+    def __len__(self) -> int:
+        return len(self._infos)
+
+    def __contains__(self, name) -> bool:
+        return name in self._infos
+
+
+CONVERTERS = _Converters(infos=INFOS, package=__name__.rsplit('.', maxsplit=1)[0])
@@ -1,23 +1,69 @@
 # built-in
+import tarfile
+from collections import defaultdict
 from io import BytesIO
 from itertools import chain
-from pathlib import Path
+from operator import itemgetter
+from pathlib import Path, PurePosixPath
 from tarfile import TarFile, TarInfo
-from tempfile import TemporaryDirectory
-from typing import Optional
+from typing import Dict, Iterator, Optional, Tuple
+from zipfile import ZipFile
 
 # external
 import attr
-from dephell_archive import ArchivePath
+from dephell_discover import Root as PackageRoot
 
 # app
 from ..config import config
-from ..controllers import Readme
 from ..models import RootDependency
 from .base import BaseConverter
 from .egginfo import EggInfoConverter
 
 
+EGG_INFO_FILES = frozenset({'PKG-INFO', 'requires.txt', 'dependency_links.txt', 'entry_points.txt'})
+
+
+def _is_egg_info(name: str) -> bool:
+    """Is it *.egg-info in the root, in a subdir, or in src dir of archive.
+    """
+    if not name.endswith('.egg-info'):
+        return False
+    parts = name.split('/')
+    return len(parts) <= 2 or (len(parts) == 3 and parts[0] == 'src')
+
+
+def _is_metafile(name: str) -> bool:
+    parent, _, fname = name.rpartition('/')
+    if 'tests' in name.split('/'):
+        return False
+    if fname in ('PKG-INFO', 'requires.txt'):
+        return True
+    if fname in EGG_INFO_FILES:
+        return parent.endswith('.egg-info')
+    return fname.endswith('.egg-info')
+
+
+def _read_metafiles(path: Path) -> Iterator[Tuple[str, str]]:
+    """Read metadata files from the archive in memory without extracting it.
+
+    Tar archives are read as a stream, so stopping the iteration early
+    saves decompression of the rest of the archive.
+    """
+    if path.suffix == '.zip':
+        with ZipFile(str(path)) as archive:
+            for info in archive.infolist():
+                name = '/'.join(PurePosixPath(info.filename).parts)
+                if not info.is_dir() and _is_metafile(name):
+                    yield name, archive.read(info).decode('utf-8')
+        return
+
+    with tarfile.open(str(path), mode='r|*') as archive:
+        for info in archive:
+            name = '/'.join(PurePosixPath(info.name).parts)
+            if info.isfile() and _is_metafile(name):
+                yield name, archive.extractfile(info).read().decode('utf-8')
+
+
 @attr.s()
 class SDistConverter(BaseConverter):
     # place all files into subdir
@@ -38,42 +84,63 @@ class SDistConverter(BaseConverter):
         path = Path(str(path))
         if path.suffix not in ('.zip', '.gz', '.tar', '.tgz', '.bz2'):
             raise ValueError('invalid file extension: ' + path.suffix)
+
+        egg_infos = defaultdict(dict)  # type: Dict[str, Dict[str, str]]
+        infos = []
+        requires = []
+        for name, content in _read_metafiles(path):
+            parent, _, fname = name.rpartition('/')
+            if _is_egg_info(parent):
+                egg_infos[parent][fname] = content
+            elif _is_egg_info(name):
+                # sometimes pypy stores only pkg-info as *.egg-info file
+                egg_infos[name]['PKG-INFO'] = content
+            elif fname == 'PKG-INFO':
+                infos.append((name.count('/'), content))
+            elif fname == 'requires.txt':
+                requires.append((name.count('/'), content))
+
+        # read *.egg-info
+        egg_infos = {name: files for name, files in egg_infos.items() if 'PKG-INFO' in files}
+        if egg_infos:
+            min_depth = min(name.count('/') for name in egg_infos)
+            names = [name for name in egg_infos if name.count('/') == min_depth]
+            if len(names) > 1:
+                raise FileExistsError('too many egg-info', names)
+            return self._load_egg_info(egg_infos[names[0]], path=path)
+
+        # read metainfo from PKG-INFO
         root = None
         converter = EggInfoConverter()
-        with TemporaryDirectory() as cache:
-            archive = ArchivePath(archive_path=path, cache_path=Path(cache))
-
-            # read *.egg-info
-            paths = chain(
-                archive.glob('*.egg-info'),
-                archive.glob('*/*.egg-info'),
-                archive.glob('src/*.egg-info'),
-                archive.glob('src/*/*.egg-info'),
-            )
-            paths = [path for path in paths if 'tests' not in path.member_path.parts]
-            if paths:
-                root = converter.load_dir(*paths)
-                root.readme = Readme.discover(path=archive)
-                return root
-
-            # read metainfo from PKG-INFO
-            paths = archive.glob('**/PKG-INFO')
-            paths = [path for path in paths if 'tests' not in path.parts]
-            if paths:
-                with paths[0].open('r') as stream:
-                    root = converter.parse_info(content=stream.read())
-
-            # read dependencies from requires.txt
-            if root is None or not root.dependencies:
-                paths = list(archive.glob('**/requires.txt'))
-                paths = [path for path in paths if 'tests' not in path.parts]
-                if paths:
-                    with paths[0].open('r') as stream:
-                        root = converter.parse_requires(content=stream.read(), root=root)
+        if infos:
+            root = converter.parse_info(content=min(infos, key=itemgetter(0))[1])
+
+        # read dependencies from requires.txt
+        if root is None or not root.dependencies:
+            if requires:
+                content = min(requires, key=itemgetter(0))[1]
+                root = converter.parse_requires(content=content, root=root)
 
         if root is None:
             msg = 'cannot find any metainfo in the archive: '
-            raise FileNotFoundError(msg + str(archive.archive_path))
+            raise FileNotFoundError(msg + str(path))
+        return root
+
+    def _load_egg_info(self, files: Dict[str, str], path: Path) -> RootDependency:
+        converter = EggInfoConverter()
+        urls = dict()
+        if 'dependency_links.txt' in files:
+            urls = converter.parse_dependency_links(files['dependency_links.txt'])
+        root = converter.parse_info(files['PKG-INFO'], urls=urls)
+        if not root.dependencies and 'requires.txt' in files:
+            root = converter.parse_requires(files['requires.txt'], root=root, urls=urls)
+        if 'entry_points.txt' in files:
+            root = converter.parse_entrypoints(files['entry_points.txt'], root=root)
+        # the archive isn't extracted, so package files are looked up near the archive
+        root.package = PackageRoot(
+            path=self.project_path or path.parent,
+            name=root.name,
+        )
         return root
 
     def dump(self, reqs, path: Path, project: RootDependency) -> None:
@@ -0,0 +1,211 @@
+# built-in
+import json
+import os
+import socket
+import sys
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from io import StringIO
+from logging import getLogger
+from pathlib import Path
+from tempfile import gettempdir
+from typing import Any, Dict, Iterator, List, Optional
+
+
+logger = getLogger('dephell.daemon')
+# commands that don't need a terminal, they are run in the client's directory
+# and can write files there (like `deps convert`)
+FORWARDED = frozenset({
+    'deps audit',
+    'deps check',
+    'deps convert',
+    'deps licenses',
+    'deps outdated',
+    'deps tree',
+    'inspect config',
+    'inspect project',
+    'package releases',
+    'package show',
+})
+# environment variables passed from the client into the daemon
+ENV_PREFIXES = ('DEPHELL_', 'PIP_', 'XDG_')
+# the active venv and the interpreters lookup depend on these variables
+ENV_NAMES = ('PATH', 'VIRTUAL_ENV')
+# the client doesn't forward commands when it's running inside of the daemon
+serving = False
+
+
+def get_socket_path() -> Path:
+    """Path to the socket in a directory that only the current user can access.
+    """
+    runtime = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime:
+        return Path(runtime) / 'dephell.sock'
+    return Path(gettempdir()) / 'dephell-{}'.format(os.getuid()) / 'dephell.sock'
+
+
+def _is_private(path: Path) -> bool:
+    """Check that the path is owned by the current user and nobody else can access it.
+    """
+    stat = path.stat()
+    return stat.st_uid == os.getuid() and not stat.st_mode & 0o077
+
+
+def get_command_name(argv: List[str]) -> str:
+    if not argv:
+        return ''
+    if len(argv) == 1 or argv[1].startswith('-'):
+        return argv[0].replace('-', ' ')
+    return ' '.join(argv[:2])
+
+
+def _read_message(connection: socket.socket) -> Optional[Dict[str, Any]]:
+    data = b''
+    while not data.endswith(b'\n'):
+        chunk = connection.recv(64 * 1024)
+        if not chunk:
+            return None
+        data += chunk
+    return json.loads(data.decode('utf8'))
+
+
+def _send_message(connection: socket.socket, message: Dict[str, Any]) -> None:
+    connection.sendall(json.dumps(message).encode('utf8') + b'\n')
+
+
+def forward(argv: List[str], path: Optional[Path] = None) -> Optional[int]:
+    """Run the command in the daemon if it's running.
+
+    Returns None if the command should be run in the current process.
+    """
+    if serving or get_command_name(argv) not in FORWARDED:
+        return None
+    # unix sockets aren't available on Windows
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+    if path is None:
+        path = get_socket_path()
+    if not path.exists():
+        return None
+    # don't send the environment (it can contain credentials) to somebody else's socket
+    if path.stat().st_uid != os.getuid():
+        logger.warning('daemon socket is owned by another user', extra=dict(path=str(path)))
+        return None
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        try:
+            connection.connect(str(path))
+        except OSError:
+            return None
+        _send_message(connection, dict(
+            argv=list(argv),
+            cwd=os.getcwd(),
+            env={name: value for name, value in os.environ.items() if _is_forwarded(name)},
+            python=sys.executable,
+        ))
+        response = _read_message(connection)
+    # the daemon refused the command
+    if response is None or response['code'] is None:
+        return None
+    sys.stdout.write(response['stdout'])
+    sys.stderr.write(response['stderr'])
+    return response['code']
+
+
+def _is_forwarded(name: str) -> bool:
+    return name.startswith(ENV_PREFIXES) or name in ENV_NAMES
+
+
+@contextmanager
+def _environ(env: Dict[str, str]) -> Iterator[None]:
+    old = dict(os.environ)
+    for name in list(os.environ):
+        if _is_forwarded(name):
+            del os.environ[name]
+    os.environ.update(env)
+    try:
+        yield
+    finally:
+        os.environ.clear()
+        os.environ.update(old)
+
+
+def run(argv: List[str], cwd: str, env: Dict[str, str], python: Optional[str] = None) -> Dict[str, Any]:
+    """Run the command in the current process and capture the output.
+
+    Commands of clients running another interpreter are refused (`code` is None),
+    because the current python is used when there is no active venv.
+    """
+    # don't resolve symlinks, python in a venv is a symlink but has own site-packages
+    if python is not None and python != sys.executable:
+        logger.debug('command refused, client runs another python', extra=dict(python=python))
+        return dict(code=None, stdout='', stderr='')
+
+    # app
+    from .cli import main
+    from .config import config
+    from .exceptions import ExtraException
+    from .networking import retry_policy
+
+    stdout = StringIO()
+    stderr = StringIO()
+    old_cwd = os.getcwd()
+    with redirect_stdout(stdout), redirect_stderr(stderr), _environ(env):
+        os.chdir(cwd)
+        config.reset()
+        try:
+            code = main(argv)
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else 0
+        except ExtraException as e:
+            logger.exception('command failed', extra=e.extra)
+            code = 1
+        # the daemon must survive any failure of the command
+        except Exception as e:  # noqa: B902
+            logger.exception('command failed', extra=dict(exception=type(e).__name__))
+            code = 1
+        finally:
+            os.chdir(old_cwd)
+    # drop the command config and bind log handlers to the real streams again
+    config.reset()
+    config.setup_logging()
+    # every command gets the full retry budget
+    retry_policy.reset()
+    return dict(code=code, stdout=stdout.getvalue(), stderr=stderr.getvalue())
+
+
+def serve(path: Optional[Path] = None) -> None:
+    """Run commands sent by clients one by one until interrupted.
+
+    Repositories, HTTP sessions and in-memory caches are kept between commands.
+    """
+    global serving
+
+    if path is None:
+        path = get_socket_path()
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    if not _is_private(path.parent):
+        raise PermissionError('socket directory is accessible by other users: ' + str(path.parent))
+    if path.exists():
+        path.unlink()
+    serving = True
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        # set permissions on creation, chmod after bind leaves the socket open for a moment
+        old_umask = os.umask(0o177)
+        try:
+            server.bind(str(path))
+        finally:
+            os.umask(old_umask)
+        server.listen()
+        logger.info('daemon started', extra=dict(path=str(path)))
+        try:
+            while True:
+                connection, _ = server.accept()
+                with connection:
+                    request = _read_message(connection)
+                    if request is None:
+                        continue
+                    _send_message(connection, run(**request))
+        finally:
+            serving = False
+            if path.exists():
+                path.unlink()
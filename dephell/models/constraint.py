@@ -1,9 +1,12 @@
 # built-in
-from copy import deepcopy
-from typing import TYPE_CHECKING, Any, Union
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Sequence, Tuple, Union
 
 # external
 from dephell_specifier import RangeSpecifier
+from dephell_specifier.constants import JoinTypes
+from dephell_specifier.specifier import Specifier
+from packaging.version import Version
 
 
 if TYPE_CHECKING:
@@ -12,8 +15,95 @@ if TYPE_CHECKING:
     from .extra_dependency import ExtraDependency  # noqa: F401
     from .root import RootDependency  # noqa: F401
 
+# Conjunction of specifiers: (lower bounds, upper bounds, other specifiers)
+Conjunction = Tuple[tuple, tuple, tuple]
+LOWER_OPERATORS = frozenset({'>', '>='})
+UPPER_OPERATORS = frozenset({'<', '<='})
+
+
+def _compile(spec) -> List[Conjunction]:
+    """Convert specifier into the union of intervals.
+
+    Only bounds are compiled into the intervals, because releases matching
+    them are always a prefix or suffix of releases sorted by version.
+    Specifiers that can't be compiled are checked one by one.
+    """
+    if isinstance(spec, RangeSpecifier) and spec.join_type == JoinTypes.OR:
+        result = []
+        for subspec in spec._specs:
+            result.extend(_compile(subspec))
+        return result
+
+    subspecs = spec._specs if isinstance(spec, RangeSpecifier) else (spec, )
+    lowers, uppers, others = [], [], []
+    for subspec in subspecs:
+        # specifiers with attached time compare releases by upload time
+        if not isinstance(subspec, Specifier) or subspec.time is not None:
+            others.append(subspec)
+        elif subspec.operator in LOWER_OPERATORS:
+            lowers.append(subspec)
+        elif subspec.operator in UPPER_OPERATORS:
+            uppers.append(subspec)
+        else:
+            others.append(subspec)
+    return [(tuple(lowers), tuple(uppers), tuple(others))]
+
+
+def _contains(spec, release) -> bool:
+    """Check that the release matches the specifier.
+
+    Specifiers check upload time of any object that has the `time` attribute,
+    so only the version is passed into specifiers without attached time.
+    It allows to not parse the upload time of every filtered release.
+    """
+    if isinstance(spec, RangeSpecifier):
+        rule = all if spec.join_type == JoinTypes.AND else any
+        return rule(_contains(subspec, release) for subspec in spec._specs)
+    if isinstance(spec, Specifier) and spec.time is None:
+        return release.version in spec
+    return release in spec
+
+
+def _bisect(releases: Sequence, predicate: Callable[[Any], bool]) -> int:
+    """Index of the first release for which the predicate becomes True.
+    """
+    left, right = 0, len(releases)
+    while left < right:
+        middle = (left + right) // 2
+        if predicate(releases[middle]):
+            right = middle
+        else:
+            left = middle + 1
+    return left
+
+
+def _filter_sorted(releases: list, conjunctions: List[Conjunction]) -> list:
+    """Filter releases sorted by version. The result is sorted too.
+    """
+    matched = []
+    for lowers, uppers, others in conjunctions:
+        left, right = 0, len(releases)
+        for spec in lowers:
+            left = max(left, _bisect(releases, lambda release, spec=spec: _contains(spec, release)))
+        for spec in uppers:
+            right = min(right, _bisect(releases, lambda release, spec=spec: not _contains(spec, release)))
+        subset = releases[left:right]
+        for spec in others:
+            subset = [release for release in subset if _contains(spec, release)]
+        matched.append(subset)
+
+    if len(matched) == 1:
+        return matched[0]
+    # restore order for the union of intervals
+    union = set()
+    for subset in matched:
+        union.update(subset)
+    return [release for release in releases if release in union]
+
 
 class Constraint:
+    _compiled: Optional[List[List[Conjunction]]] = None
+
     def __init__(self, source: Union['Dependency', 'ExtraDependency', 'RootDependency'], spec: Any) -> None:
         """
         source (Dependency)
@@ -21,6 +111,7 @@ class Constraint:
         """
         self._specs = {source.name: RangeSpecifier(spec)}
         self._groups = {source.name: source.group.number}
+        self._compiled = None
 
     # properties
 
@@ -46,6 +137,7 @@ class Constraint:
         """
         for spec in self._specs.values():
             spec.attach_time(releases)
+        self._compiled = None
 
     def apply(self, dep, spec) -> None:
         if dep.name in self._groups:
@@ -57,27 +149,49 @@ class Constraint:
         # save params
         self._specs[dep.name] = RangeSpecifier(spec)
         self._groups[dep.name] = dep.group.number
+        self._compiled = None
 
     def unapply(self, name: str) -> None:
         if name not in self._specs:
             return
         del self._specs[name]
         del self._groups[name]
+        self._compiled = None
 
-    def filter(self, releases) -> set:
+    def filter(self, releases, ordered: bool = False) -> set:
         """Filter releases
+
+        ordered -- releases are already sorted by version (ascending or descending).
         """
+        if self._compiled is None:
+            self._compiled = [_compile(spec) for spec in self._specs.values()]
+
         result = set()
+        versioned = []
         for release in releases:
-            for spec in self._specs.values():
-                if release not in spec:
-                    break
-            else:
+            if isinstance(release.version, Version):
+                versioned.append(release)
+            # legacy versions don't fit into the intervals
+            elif all(_contains(spec, release) for spec in self._specs.values()):
                 result.add(release)
+
+        if not ordered:
+            versioned.sort(key=attrgetter('version'))
+        elif len(versioned) > 1 and versioned[0].version > versioned[-1].version:
+            versioned.reverse()
+        for conjunctions in self._compiled:
+            versioned = _filter_sorted(versioned, conjunctions)
+        result.update(versioned)
         return result
 
     def copy(self) -> 'Constraint':
-        return deepcopy(self)
+        """Copy constraint. Only specs containers are copied, specifiers are shared.
+        """
+        obj = type(self).__new__(type(self))
+        obj._specs = {name: spec.copy() for name, spec in self._specs.items()}
+        obj._groups = self._groups.copy()
+        obj._compiled = self._compiled
+        return obj
 
     # magic methods
 
@@ -98,6 +212,7 @@ class Constraint:
                 self._specs[name] += spec
             else:
                 self._specs[name] = spec
+        self._compiled = None
         return self
 
     def __or__(self, other):
@@ -113,6 +228,7 @@ class Constraint:
                 self._specs[name] = RangeSpecifier(str(self._specs[name]) + '||' + str(spec))
             else:
                 self._specs[name] = spec
+        self._compiled = None
         return self
 
     def __str__(self) -> str:
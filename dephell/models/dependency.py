@@ -1,5 +1,5 @@
 # built-in
-from copy import deepcopy
+from copy import copy, deepcopy
 from pathlib import Path
 from typing import Dict, Set, Tuple
 
@@ -178,10 +178,24 @@ class Dependency:
             self.unlock()
 
     def copy(self) -> 'Dependency':
-        obj = deepcopy(self)
+        """Copy unlocked dependency.
+
+        Repo, link and releases are shared with the original dependency,
+        only constraint, markers and other mutable containers are copied.
+        """
+        obj = copy(self)
+        obj.__dict__.pop('group', None)
         obj.constraint = self.constraint.copy()
-        if obj.locked:
-            obj.unlock()
+        obj.marker = self.marker.copy()
+        obj.links = self.links.copy()
+        obj.envs = self.envs.copy()
+        obj.inherited_envs = self.inherited_envs.copy()
+        obj.locations = self.locations.copy()
+        if 'groups' in self.__dict__:
+            obj.__dict__['groups'] = self.groups.copy(dep=obj)
+        # deps from the lockfile get envs from the parent
+        if 'dependencies' in self.__dict__:
+            obj.__dict__['dependencies'] = deepcopy(self.__dict__['dependencies'])
         return obj
 
     # magic methods
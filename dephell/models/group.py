@@ -23,6 +23,13 @@ class Group:
         self.number = number
         self.dep = dep
 
+    def copy(self, dep=None) -> 'Group':
+        """Copy group for another dependency, releases are shared.
+        """
+        obj = type(self)(number=self.number, releases=self.all_releases, dep=dep)
+        obj.releases = self.releases
+        return obj
+
     # BEST RELEASE PROPERTIES
 
     @property
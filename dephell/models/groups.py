@@ -6,6 +6,7 @@ from typing import Iterator, Optional
 import attr
 
 # app
+from ..cache import batch
 from ..cached_property import cached_property
 from ..config import config
 from .group import Group
@@ -46,12 +47,25 @@ class Groups:
             raise LookupError('cannot find releases for ' + self.dep.name)
         return releases
 
+    def copy(self, dep) -> 'Groups':
+        """Copy groups for the copy of the dependency.
+
+        Releases and their loaded dependencies are shared,
+        so the copy doesn't fetch them again.
+        """
+        obj = type(self)(dep=dep, extra=self.extra)
+        if 'releases' in self.__dict__:
+            obj.__dict__['releases'] = self.__dict__['releases']
+        obj._loaded_groups = [group.copy(dep=dep) for group in self._loaded_groups]
+        obj._loaded_releases_count = self._loaded_releases_count
+        return obj
+
     async def _fetch_all_deps(self, releases):
         tasks = []
         not_loaded_releases = []
         tasks_count = 0
         for release in releases:
-            if 'dependencies' in release.__dict__:
+            if release.dependencies is not None:
                 continue
             task = asyncio.ensure_future(self.dep.repo.get_dependencies(
                 name=release.name,
@@ -68,6 +82,20 @@ class Groups:
         for release, response in zip(not_loaded_releases, responses):
             release.dependencies = response
 
+    async def prefetch(self) -> None:
+        """Fetch dependencies for releases that the resolver will check first.
+        """
+        releases = self.releases
+        filtrate = self.dep.constraint.filter
+        for release in filtrate(releases, ordered=True):
+            if release.dependencies is not None:
+                return
+
+        first = releases[:ONE_GROUP_RELEASES]
+        await self._fetch_all_deps(first)
+        if not filtrate(first, ordered=True):
+            await self._fetch_releases_deps()
+
     async def _fetch_missed_deps(self, releases):
         if len(releases) <= 3:
             await self._fetch_all_deps(releases)
@@ -113,7 +141,7 @@ class Groups:
         missed = []
         for release in releases:
             # collect missed releases
-            if 'dependencies' not in release.__dict__:
+            if release.dependencies is None:
                 missed.append(release)
                 continue
 
@@ -181,9 +209,10 @@ class Groups:
         prev_key = None
         releases = []
         for release in self.releases[self._loaded_releases_count:]:
-            if 'dependencies' not in release.__dict__:
+            if release.dependencies is None:
                 future = asyncio.ensure_future(self._fetch_releases_deps())
-                loop.run_until_complete(future)
+                with batch():
+                    loop.run_until_complete(future)
 
             key = get_key(release)
             if prev_key is None:
@@ -213,5 +242,5 @@ class Groups:
 
         filtrate = self.dep.constraint.filter
         for group in groups:
-            group.releases = filtrate(group.all_releases)
+            group.releases = filtrate(group.all_releases, ordered=True)
         return True
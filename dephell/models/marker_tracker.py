@@ -1,5 +1,5 @@
 # built-in
-from typing import Dict, Union
+from typing import Dict, Optional, Union
 
 # external
 from dephell_markers import Markers, OrMarker
@@ -44,12 +44,30 @@ class MarkerTracker:
         for source, marker in other._markers.items():
             self._markers[source] = marker
 
+    def get(self, source) -> Optional[Markers]:
+        if type(source) is not str:
+            source = source.name
+        return self._markers.get(source)
+
+    def restrict(self, markers: Union[str, Markers]) -> None:
+        """Add markers as `and` to the markers from every source.
+        """
+        for source, marker in self._markers.items():
+            marker = Markers(str(marker))
+            marker &= Markers(str(markers))
+            self._markers[source] = marker
+
     def unapply(self, source) -> None:
         if type(source) is not str:
             source = source.name
         if source in self._markers:
             del self._markers[source]
 
+    def copy(self) -> 'MarkerTracker':
+        obj = type(self)()
+        obj._markers = self._markers.copy()
+        return obj
+
     def __getattr__(self, name: str):
         if name not in dir(Markers):
             raise AttributeError(name)
@@ -1,53 +1,91 @@
 # built-in
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 # external
 import attr
 from dephell_specifier import RangeSpecifier
 from packaging.utils import canonicalize_name
-from packaging.version import parse
+from packaging.version import Version, parse
 
-# app
-from ..cached_property import cached_property
 
+TIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
+# parsed versions shared between all releases: the same version strings
+# are repeated in many packages
+_versions: Dict[str, Version] = dict()
 
-@attr.s(hash=False, eq=False, order=False)
+
+def parse_version(version) -> Version:
+    if not isinstance(version, str):
+        return version
+    parsed = _versions.get(version)
+    if parsed is None:
+        parsed = _versions[version] = parse(version)
+    return parsed
+
+
+@attr.s(hash=False, eq=False, order=False, slots=True)
 class Release:
-    dependencies = None  # type: tuple
+    """Release of a package.
 
+    Upload time and python constraint can be passed as strings,
+    they are parsed on the first access because most of the releases
+    are filtered out by constraints before it.
+    """
     raw_name: str = attr.ib()
-    version: str = attr.ib(converter=parse)              # type: ignore
-    time = attr.ib(repr=False)                      # upload_time
-    python = attr.ib(default=None, repr=False)      # requires_python
+    version: str = attr.ib(converter=parse_version)  # type: ignore
+    _time = attr.ib(repr=False)                     # upload_time
+    _python = attr.ib(default=None, repr=False)     # requires_python
     hashes = attr.ib(factory=tuple, repr=False)     # digests/sha256
     urls = attr.ib(factory=tuple, repr=False)       # url
 
     extra: Optional[str] = attr.ib(default=None)
 
+    # None if dependencies aren't fetched yet
+    dependencies: Optional[tuple] = attr.ib(default=None, init=False, repr=False)
+    _name: Optional[str] = attr.ib(default=None, init=False, repr=False)
+
     def __attrs_post_init__(self) -> None:
         assert '[' not in self.raw_name, self.raw_name
 
     @classmethod
     def from_response(cls, name: str, version: str, info: List[Dict[str, Any]], extra=None) -> 'Release':
         latest = info[-1]
-        python = latest['requires_python']
-        if python is not None:
-            python = RangeSpecifier(python)
-
         return cls(
             raw_name=name,
             version=version,
-            time=datetime.strptime(latest['upload_time'], '%Y-%m-%dT%H:%M:%S'),
-            python=python,
+            time=latest['upload_time'],
+            python=latest['requires_python'],
             hashes=tuple(rel['digests']['sha256'] for rel in info),
             urls=tuple(rel['url'] for rel in info),
             extra=extra,
         )
 
-    @cached_property
+    @property
     def name(self) -> str:
-        return canonicalize_name(self.raw_name)
+        if self._name is None:
+            self._name = canonicalize_name(self.raw_name)
+        return self._name
+
+    @property
+    def time(self) -> datetime:
+        if isinstance(self._time, str):
+            self._time = datetime.strptime(self._time, TIME_FORMAT)
+        return self._time
+
+    @time.setter
+    def time(self, time: Union[datetime, str]) -> None:
+        self._time = time
+
+    @property
+    def python(self) -> Optional[RangeSpecifier]:
+        if isinstance(self._python, str):
+            self._python = RangeSpecifier(self._python)
+        return self._python
+
+    @python.setter
+    def python(self, python: Union[RangeSpecifier, str, None]) -> None:
+        self._python = python
 
     def __hash__(self) -> int:
         return hash((self.name, self.version))
@@ -64,9 +102,12 @@ class Release:
     def __lt__(self, other) -> str:
         if not isinstance(other, type(self)):
             return NotImplemented
-        left = (self.name, self.version, self.time)
-        right = (other.name, other.version, other.time)
-        return left < right
+        left = (self.name, self.version)
+        right = (other.name, other.version)
+        if left != right:
+            return left < right
+        # parse time only when it's needed
+        return self.time < other.time
 
     def __str__(self):
         return '{name}=={version}'.format(name=self.raw_name, version=self.version)
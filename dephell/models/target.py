@@ -0,0 +1,86 @@
+# built-in
+import re
+from typing import Dict, Optional
+
+# external
+import attr
+
+
+REX_TARGET = re.compile(r'(?P<implementation>[a-z]*)(?P<version>\d+(?:\.\d+)*)(?::(?P<platform>[a-z0-9]+))?')
+PLATFORMS = dict(
+    linux=('Linux', 'posix'),
+    darwin=('Darwin', 'posix'),
+    win32=('Windows', 'nt'),
+)
+IMPLEMENTATIONS = dict(
+    cpython='CPython',
+    pypy='PyPy',
+    jython='Jython',
+    ironpython='IronPython',
+)
+
+
+@attr.s(frozen=True)
+class Target:
+    """Interpreter and platform for which dependencies are locked.
+
+    Markers that aren't described by the target (like `platform_machine`)
+    are evaluated for the current interpreter.
+    """
+    name = attr.ib(type=str)
+    python = attr.ib(type=str)                      # python_version
+    implementation = attr.ib(type=str, default='cpython')
+    platform = attr.ib(type=Optional[str], default=None)   # sys_platform
+
+    @classmethod
+    def parse(cls, text: str) -> 'Target':
+        """Parse target like `3.8`, `3.8:linux` or `pypy3.9:darwin`.
+        """
+        match = REX_TARGET.fullmatch(text.strip().lower())
+        if match is None:
+            raise ValueError('invalid target: ' + text)
+        implementation = match.group('implementation') or 'cpython'
+        if implementation == 'python':
+            implementation = 'cpython'
+        if implementation not in IMPLEMENTATIONS:
+            raise ValueError('unknown python implementation: ' + implementation)
+        return cls(
+            name=text.strip(),
+            python=match.group('version'),
+            implementation=implementation,
+            platform=match.group('platform'),
+        )
+
+    @property
+    def environment(self) -> Dict[str, str]:
+        """Values of markers for the target.
+        """
+        parts = self.python.split('.')
+        full_version = '.'.join((parts + ['0', '0'])[:3])
+        result = dict(
+            python_version='.'.join(parts[:2]),
+            python_full_version=full_version,
+            implementation_name=self.implementation,
+            implementation_version=full_version,
+            platform_python_implementation=IMPLEMENTATIONS[self.implementation],
+        )
+        if self.platform is not None:
+            result['sys_platform'] = self.platform
+            if self.platform in PLATFORMS:
+                result['platform_system'], result['os_name'] = PLATFORMS[self.platform]
+        return result
+
+    @property
+    def marker(self) -> str:
+        """Marker that matches only this target.
+        """
+        env = self.environment
+        result = 'python_version == "{}"'.format(env['python_version'])
+        if self.implementation != 'cpython':
+            result += ' and implementation_name == "{}"'.format(self.implementation)
+        if self.platform is not None:
+            result += ' and sys_platform == "{}"'.format(self.platform)
+        return result
+
+    def __str__(self) -> str:
+        return self.name
@@ -1,14 +1,27 @@
 # built-in
-from functools import partial, update_wrapper
+import asyncio
+import atexit
+import random
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache, partial, update_wrapper
+from inspect import isawaitable
 from logging import getLogger
-from ssl import create_default_context
-from time import sleep
-from typing import Any, Optional
+from ssl import SSLContext, create_default_context
+from typing import Any, Dict, Mapping, Optional
+from weakref import WeakKeyDictionary
 
 # external
+import attr
 import certifi
 import requests
-from aiohttp import ClientError, ClientSession, TCPConnector
+from aiohttp import (
+    ClientConnectionError, ClientError, ClientPayloadError, ClientResponseError, ClientSession, TCPConnector,
+)
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError, Timeout as RequestsTimeout
 from requests.sessions import Session
 
 # project
@@ -20,25 +33,179 @@ from .config import config
 
 
 USER_AGENT = 'DepHell/{version}'.format(version=__version__)
+# How many connections can be opened to the same host at the same time.
+CONNECTIONS_PER_HOST = 16
+# How long (in seconds) an idle connection is kept alive for reusing.
+KEEPALIVE_TIMEOUT = 30
 logger = getLogger('dephell.networking')
+# connectors are bound to the event loop, so we keep them for every loop and CA file
+_connectors = WeakKeyDictionary()  # type: WeakKeyDictionary
+# statuses of responses that are worth to be retried
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# methods that are safe to be retried
+RETRY_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
 
 
-def aiohttp_session(*, auth: Optional[Auth] = None, **kwargs: Any) -> ClientSession:
-    headers = {'User-Agent': USER_AGENT}
-    if auth:
-        headers['Authorization'] = auth.encode()
+@attr.s()
+class RetryPolicy:
+    """Retries for network requests shared by `requests` and `aiohttp`.
 
-    # setup SSL
+    Delays grow exponentially with full jitter, `Retry-After` header
+    is respected. The total number of retries per run is limited by `budget`.
+    """
+    count = attr.ib(type=int, default=4)        # attempts for one request
+    base = attr.ib(type=float, default=0.5)     # delay before the first retry
+    cap = attr.ib(type=float, default=30)       # maximal delay
+    budget = attr.ib(type=int, default=100)     # retries for the whole run
+    stats = attr.ib(factory=Counter, repr=False)
+
+    def should_retry(self, *, exc: Optional[BaseException] = None, status: Optional[int] = None) -> bool:
+        if status is not None:
+            return status in RETRY_STATUSES
+        if isinstance(exc, ClientResponseError):
+            return exc.status in RETRY_STATUSES
+        return isinstance(exc, (
+            asyncio.TimeoutError, ClientConnectionError, ClientPayloadError,
+            RequestsConnectionError, RequestsTimeout,
+        ))
+
+    def get_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        delay = self._parse_retry_after(retry_after)
+        if delay is None:
+            delay = random.uniform(0, self.base * 2 ** (attempt - 1))
+        return min(delay, self.cap)
+
+    def spend(self, reason: str) -> bool:
+        """Take one retry from the budget. Returns False if budget is exhausted.
+        """
+        if self.stats['retries'] >= self.budget:
+            self.stats['exhausted'] += 1
+            return False
+        self.stats['retries'] += 1
+        self.stats[reason] += 1
+        return True
+
+    def report(self) -> None:
+        """Log how many requests were retried in this run and why.
+        """
+        if not self.stats:
+            return
+        if self.stats['exhausted']:
+            logger.warning('retries budget is exhausted', extra=dict(self.stats))
+            return
+        logger.info('network requests were retried', extra=dict(self.stats))
+
+    def reset(self) -> None:
+        """Restore the budget, for example, before the next command in the daemon.
+        """
+        self.stats.clear()
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            return None
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=timezone.utc)
+        return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+
+
+retry_policy = RetryPolicy()
+
+
+def _get_reason(*, exc: Optional[BaseException] = None, status: Optional[int] = None) -> str:
+    if status is None and isinstance(exc, ClientResponseError):
+        status = exc.status
+    if status is not None:
+        return 'status_{}'.format(status)
+    return type(exc).__name__
+
+
+@lru_cache(maxsize=4)
+def _make_ssl_context(cafile: str) -> SSLContext:
+    return create_default_context(cafile=cafile)
+
+
+def get_ssl_context() -> SSLContext:
     cafile = config.get('ca')
     if not cafile:
         cafile = certifi.where()
-    ssl_context = create_default_context(cafile=cafile)
+    return _make_ssl_context(cafile)
+
+
+def get_connector() -> TCPConnector:
+    """Get process-wide connector for the current event loop.
+
+    The connector keeps connections alive to reuse them between sessions.
+    """
+    loop = asyncio.get_event_loop()
+    cafile = config.get('ca') or ''
+    connectors = _connectors.setdefault(loop, dict())
+    connector = connectors.get(cafile)
+    if connector is not None and not connector.closed:
+        return connector
+
+    ssl_context = get_ssl_context()
+    params = dict(limit_per_host=CONNECTIONS_PER_HOST, keepalive_timeout=KEEPALIVE_TIMEOUT)
     try:
-        connector = TCPConnector(ssl=ssl_context)
+        connector = TCPConnector(ssl=ssl_context, **params)
     except TypeError:
-        connector = TCPConnector(ssl_context=ssl_context)
+        connector = TCPConnector(ssl_context=ssl_context, **params)
+    connectors[cafile] = connector
+    return connector
+
 
-    return ClientSession(headers=headers, connector=connector, **kwargs)
+@atexit.register
+def _close_connectors() -> None:
+    for loop, connectors in list(_connectors.items()):
+        for connector in connectors.values():
+            if connector.closed:
+                continue
+            result = connector.close()
+            if isawaitable(result) and not loop.is_closed() and not loop.is_running():
+                loop.run_until_complete(result)
+    _connectors.clear()
+
+
+def aiohttp_session(*, auth: Optional[Auth] = None, **kwargs: Any) -> ClientSession:
+    """Make a light-weight session on top of the shared connections pool.
+
+    Closing the session doesn't close the pool.
+    """
+    headers = {'User-Agent': USER_AGENT}
+    if auth:
+        headers['Authorization'] = auth.encode()
+    return ClientSession(headers=headers, connector=get_connector(), connector_owner=False, **kwargs)
+
+
+class RetryAdapter(HTTPAdapter):
+    """HTTPAdapter for `requests` that retries idempotent requests by `retry_policy`.
+    """
+    def send(self, request, **kwargs):
+        for attempt in range(1, retry_policy.count + 1):
+            last = attempt == retry_policy.count or request.method not in RETRY_METHODS
+            try:
+                response = super().send(request, **kwargs)
+            except (RequestsConnectionError, RequestsTimeout) as exc:
+                if last or not retry_policy.spend(_get_reason(exc=exc)):
+                    raise
+                delay = retry_policy.get_delay(attempt)
+            else:
+                if not retry_policy.should_retry(status=response.status_code):
+                    return response
+                if last or not retry_policy.spend(_get_reason(status=response.status_code)):
+                    return response
+                delay = retry_policy.get_delay(attempt, retry_after=response.headers.get('Retry-After'))
+                response.close()
+            logger.debug('request failed, repeating...', extra=dict(url=request.url, delay=round(delay, 2)))
+            time.sleep(delay)
+        raise RuntimeError('unreachable')
 
 
 def requests_session(*, auth: Optional[Any] = None, headers: Optional[Any] = None, **kwargs: Any) -> Session:
@@ -51,6 +218,11 @@ def requests_session(*, auth: Optional[Any] = None, headers: Optional[Any] = Non
     if cafile:
         session.verify = cafile
 
+    # setup retries
+    adapter = RetryAdapter()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
     # set headers
     if headers is None:
         headers = dict()
@@ -62,19 +234,50 @@ def requests_session(*, auth: Optional[Any] = None, headers: Optional[Any] = Non
     return session
 
 
-def aiohttp_repeat(func=None, *, count: int = 4):
+def get_validators(headers: Mapping[str, str]) -> Dict[str, str]:
+    """Extract validators from the response headers to make conditional requests later.
+    """
+    validators = dict()
+    for name in ('ETag', 'Last-Modified'):
+        value = headers.get(name)
+        if value:
+            validators[name] = value
+    return validators
+
+
+def get_conditional_headers(validators: Optional[Mapping[str, str]]) -> Dict[str, str]:
+    """Make request headers to get 304 response if content is not modified.
+    """
+    headers = dict()
+    if not validators:
+        return headers
+    if validators.get('ETag'):
+        headers['If-None-Match'] = validators['ETag']
+    if validators.get('Last-Modified'):
+        headers['If-Modified-Since'] = validators['Last-Modified']
+    return headers
+
+
+def aiohttp_repeat(func=None, *, count: Optional[int] = None):
+    """Retry coroutine on connection errors and retriable response statuses.
+    """
     if func is None:
-        return partial(func, count=count)
+        return partial(aiohttp_repeat, count=count)
 
     async def wrapper(*args: Any, **kwargs: Any) -> Optional[Any]:
-        for pause in range(1, count + 1):
+        attempts = count or retry_policy.count
+        for attempt in range(1, attempts + 1):
             try:
                 return await func(*args, **kwargs)
-            except ClientError:
-                if pause == count:
+            except (ClientError, asyncio.TimeoutError) as exc:
+                if attempt == attempts or not retry_policy.should_retry(exc=exc):
+                    raise
+                if not retry_policy.spend(_get_reason(exc=exc)):
                     raise
-                logger.debug('aiohttp payload error, repeating...', exc_info=True)
-                sleep(pause)
+                headers = getattr(exc, 'headers', None) or dict()
+                delay = retry_policy.get_delay(attempt, retry_after=headers.get('Retry-After'))
+                logger.debug('request failed, repeating...', exc_info=True, extra=dict(delay=round(delay, 2)))
+                await asyncio.sleep(delay)
         raise RuntimeError('unreachable')
 
     wrapper = update_wrapper(wrapper=wrapper, wrapped=func)
@@ -11,7 +11,6 @@ import attr
 
 # app
 from .cached_property import cached_property
-from .converters import PIPConverter
 from .models import Requirement
 
 
@@ -33,6 +32,9 @@ class PackageManager:
     # methods
 
     def install(self, reqs: Iterable[Requirement]) -> int:
+        # app
+        from .converters import PIPConverter
+
         args = ['--no-deps', '--pre']
         if self.is_global:
             args.append('--user')
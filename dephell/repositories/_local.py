@@ -58,9 +58,8 @@ class LocalRepo(Interface):
 
         # load from file
         if self.path.is_file():
-            for converter in CONVERTERS.values():
-                if converter.can_parse(path=self.path):
-                    return converter.load(path=self.path)
+            for _, converter in CONVERTERS.detect(path=self.path):
+                return converter.load(path=self.path)
             raise LookupError('cannot find loader for file ' + str(self.path))
 
         # get from wheel or sdist
@@ -100,9 +99,8 @@ class LocalRepo(Interface):
             path = self.path / fname
             if not path.exists():
                 continue
-            for converter in CONVERTERS.values():
-                if converter.can_parse(path=path):
-                    return converter.load(path=path)
+            for _, converter in CONVERTERS.detect(path=path):
+                return converter.load(path=path)
 
         raise LookupError('cannot find dependencies in ' + str(self.path))
 
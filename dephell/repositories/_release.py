@@ -1,4 +1,5 @@
 # built-in
+from copy import copy
 from datetime import datetime
 from typing import Optional
 
@@ -18,7 +19,8 @@ class ReleaseRepo(Interface):
 
     def get_releases(self, dep) -> tuple:
         if self.releases:
-            return tuple(release for release in self.releases if release.name == dep.base_name)
+            # every dependency gets its own releases like from a real repository
+            return tuple(copy(release) for release in self.releases if release.name == dep.base_name)
 
         release = Release(
             raw_name=dep.raw_name,
@@ -15,10 +15,13 @@ from packaging.requirements import Requirement
 # app
 from ...cache import JSONCache, TextCache
 from ...config import config
+from ...constants import WAREHOUSE_DOMAINS
 from ...exceptions import InvalidFieldsError, PackageNotFoundError
 from ...models.author import Author
 from ...models.release import Release
-from ...networking import aiohttp_session, requests_session
+from ...networking import (
+    aiohttp_repeat, aiohttp_session, get_conditional_headers, get_validators, requests_session,
+)
 from ._base import WarehouseBaseRepo
 
 
@@ -40,6 +43,8 @@ _fields = {
 }
 # Do not download too big files
 SIZE_LIMIT = 2 * 1024 * 1024  # 2 Mb
+# only the central directory and METADATA are fetched from wheels if the server supports ranges
+WHEEL_SIZE_LIMIT = 30 * 1024 * 1024  # 30 Mb
 
 
 @attr.s()
@@ -73,12 +78,21 @@ class WarehouseAPIRepo(WarehouseBaseRepo):
         data = cache.load()
         if data is None:
             url = '{url}{name}/json'.format(url=self.url, name=dep.base_name)
+            # revalidate expired entry instead of downloading it again
+            stale = cache.load_stale()
+            headers = get_conditional_headers(cache.validators.load()) if stale is not None else dict()
             with requests_session() as session:
-                response = session.get(url, auth=self.auth)
-            if response.status_code == 404:
-                raise PackageNotFoundError(package=dep.base_name, url=url)
-            data = response.json()
-            cache.dump(data)
+                response = session.get(url, auth=self.auth, headers=headers)
+            if response.status_code == 304 and stale is not None:
+                logger.debug('releases not modified', extra=dict(url=url))
+                cache.touch()
+                data = stale
+            else:
+                if response.status_code == 404:
+                    raise PackageNotFoundError(package=dep.base_name, url=url)
+                data = response.json()
+                cache.dump(data)
+                cache.validators.dump(get_validators(response.headers))
         elif isinstance(data, str) and data == '':
             return ()
 
@@ -244,6 +258,7 @@ class WarehouseAPIRepo(WarehouseBaseRepo):
             return license_classifier
         return data['license']
 
+    @aiohttp_repeat
     async def _get_from_json(self, *, name, version):
         url = urljoin(self.url, posixpath.join(name, str(version), 'json'))
         async with aiohttp_session(auth=self.auth) as session:
@@ -272,6 +287,25 @@ class WarehouseAPIRepo(WarehouseBaseRepo):
         #     if file_info['packagetype'] == 'bdist_wheel':
         #         return ()
 
+        # PEP 658: the index can serve metadata of wheels, so we don't need to download them.
+        # PyPI serves it for all wheels, but doesn't mark it in the JSON API.
+        is_pypi = urlparse(self.url).hostname in WAREHOUSE_DOMAINS
+        for file_info in files_info:
+            if file_info['packagetype'] != 'bdist_wheel':
+                continue
+            digest = self._parse_metadata_flag(file_info.get(
+                'core-metadata',
+                file_info.get('data-dist-info-metadata'),
+            ))
+            if digest is None and is_pypi:
+                digest = ''
+            if digest is None:
+                continue
+            deps = await self._get_deps_from_metadata(url=file_info['url'], digest=digest)
+            if deps is not None:
+                return deps
+            break
+
         # app
         from ...converters import SDistConverter, WheelConverter
 
@@ -287,7 +321,8 @@ class WarehouseAPIRepo(WarehouseBaseRepo):
 
         for converter, checker in rules:
             for file_info in files_info:
-                if file_info.get('size') > SIZE_LIMIT:
+                limit = WHEEL_SIZE_LIMIT if converter is wheel else SIZE_LIMIT
+                if file_info.get('size') > limit:
                     continue
                 if not checker(file_info):
                     continue
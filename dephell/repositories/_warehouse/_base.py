@@ -1,10 +1,14 @@
 # built-in
+import asyncio
 import re
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha256
 from logging import getLogger
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from typing import Any, Tuple
+from typing import Any, Callable, Dict, Optional, Tuple  # noqa: F401
 from urllib.parse import urlparse, urlunparse
+from zipfile import BadZipFile
 
 # external
 from dephell_markers import Markers
@@ -12,9 +16,11 @@ from packaging.requirements import InvalidRequirement, Requirement
 
 # app
 from ...cached_property import cached_property
+from ...config import config
 from ...constants import WAREHOUSE_DOMAINS
 from ...networking import aiohttp_repeat, aiohttp_session
 from ..base import Interface
+from ._remote_zip import RangesNotSupportedError, RemoteZip
 
 
 try:
@@ -26,6 +32,26 @@ except ImportError:
 
 logger = getLogger('dephell.repositories.warehouse')
 REX_WORD = re.compile('[a-zA-Z]+')
+# executors for parsing of archives, by workers count
+_executors = dict()  # type: Dict[int, ThreadPoolExecutor]
+
+
+async def run_parser(func: Callable, *args) -> Any:
+    """Run CPU-bound parsing in the thread pool to not block other downloads.
+    """
+    workers = config['workers']
+    if not workers:
+        return func(*args)
+    executor = _executors.get(workers)
+    if executor is None:
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='dephell-parser')
+        _executors[workers] = executor
+    return await asyncio.get_event_loop().run_in_executor(executor, func, *args)
+
+
+def is_metadata(name: str) -> bool:
+    parent, _, fname = name.rpartition('/')
+    return fname == 'METADATA' and parent.endswith('.dist-info') and '/' not in parent
 
 
 class WarehouseBaseRepo(Interface):
@@ -121,22 +147,85 @@ class WarehouseBaseRepo(Interface):
         return tuple(result)
 
     async def _download_and_parse(self, *, url: str, converter) -> Tuple[str, ...]:
+        # app
+        from ...converters import WheelConverter
+
+        if isinstance(converter, WheelConverter):
+            return await self._get_deps_from_wheel(url=url, converter=converter)
+
         with TemporaryDirectory() as tmp:
             fname = urlparse(url).path.strip('/').rsplit('/', maxsplit=1)[-1]
             path = Path(tmp) / fname
             await self._download(url=url, path=path)
 
-            # load and make separated dep for every env
-            root = converter.load(path)
-            deps = []
-            for dep in root.dependencies:
-                if dep.envs == {'main'}:
+            return self._get_deps_from_root(await run_parser(converter.load, path))
+
+    @aiohttp_repeat
+    async def _get_deps_from_metadata(self, *, url: str, digest: str = '') -> Optional[Tuple[str, ...]]:
+        """Get deps from the metadata file served by the index next to the distribution.
+
+        https://www.python.org/dev/peps/pep-0658/
+        Returns None if the metadata file isn't available,
+        so the caller can fall back to the distribution itself.
+        """
+        # app
+        from ...converters import WheelConverter
+
+        url = url.split('#', maxsplit=1)[0] + '.metadata'
+        async with aiohttp_session(auth=self.auth) as session:
+            async with session.get(url) as response:
+                if response.status >= 300:
+                    logger.debug('cannot get metadata file', extra=dict(url=url, status=response.status))
+                    return None
+                content = await response.read()
+        if digest and sha256(content).hexdigest() != digest:
+            logger.warning('metadata hash mismatch', extra=dict(url=url))
+            return None
+        logger.debug('dependencies from metadata file', extra=dict(url=url))
+        root = await run_parser(WheelConverter().loads, content.decode('utf8'))
+        return self._get_deps_from_root(root)
+
+    @aiohttp_repeat
+    async def _get_deps_from_wheel(self, *, url: str, converter) -> Tuple[str, ...]:
+        """Get deps from METADATA of the remote wheel without downloading the whole wheel.
+        """
+        archive = RemoteZip(url=url.split('#', maxsplit=1)[0], auth=self.auth)
+        try:
+            _, content = await archive.read(is_metadata)
+        except (KeyError, BadZipFile) as e:
+            raise FileNotFoundError('cannot find METADATA in wheel: ' + url) from e
+        except RangesNotSupportedError as e:
+            raise FileNotFoundError('server does not support ranges and wheel is too big: ' + url) from e
+        logger.debug('dependencies from remote wheel', extra=dict(url=url, requests=archive.requests))
+        return self._get_deps_from_root(await run_parser(converter.loads, content.decode('utf8')))
+
+    @staticmethod
+    def _get_deps_from_root(root) -> Tuple[str, ...]:
+        # make separated dep for every env
+        deps = []
+        for dep in root.dependencies:
+            if dep.envs == {'main'}:
+                deps.append(str(dep))
+            else:
+                for env in dep.envs.copy() - {'main'}:
+                    dep.envs = {env}
                     deps.append(str(dep))
-                else:
-                    for env in dep.envs.copy() - {'main'}:
-                        dep.envs = {env}
-                        deps.append(str(dep))
-            return tuple(deps)
+        return tuple(deps)
+
+    @staticmethod
+    def _parse_metadata_flag(value) -> Optional[str]:
+        """Get sha256 of the metadata file from the index, empty string if hash is unknown.
+
+        The value can be from HTML (`true`, `sha256=...`) or JSON (`true`, `{"sha256": ...}`)
+        simple index. Returns None if the metadata isn't available.
+        """
+        if value is None or value is False or value == 'false':
+            return None
+        if isinstance(value, dict):
+            return value.get('sha256', '')
+        if isinstance(value, str) and value.startswith('sha256='):
+            return value[len('sha256='):]
+        return ''
 
     @aiohttp_repeat
     async def _download(self, *, url: str, path: Path) -> None:
@@ -0,0 +1,147 @@
+# built-in
+import re
+from logging import getLogger
+from typing import Callable, List, Optional, Tuple
+from zipfile import ZipFile
+
+# external
+import attr
+
+# app
+from ...networking import aiohttp_session
+
+
+logger = getLogger('dephell.repositories.warehouse')
+REX_CONTENT_RANGE = re.compile(r'bytes (\d+)-(\d+)/(\d+)')
+# the central directory is in the end of archive, try to get it in one request
+TAIL_SIZE = 64 * 1024
+MIN_RANGE_SIZE = 64 * 1024
+MAX_REQUESTS = 10
+# how much to download if the server doesn't support ranges
+FULL_SIZE_LIMIT = 2 * 1024 * 1024  # 2 Mb
+
+
+class MissedRangeError(Exception):
+    """Requested part of the remote file isn't fetched yet.
+    """
+    def __init__(self, start: int, end: int) -> None:
+        self.start = start
+        self.end = end
+        super().__init__(start, end)
+
+
+class RangesNotSupportedError(Exception):
+    """The server sends the whole file, and the file is too big to download it.
+    """
+
+
+class SparseFile:
+    """Read-only file-like object where only some ranges of content are known.
+    """
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.position = 0
+        self.blocks: List[Tuple[int, bytes]] = []
+
+    def add(self, start: int, content: bytes) -> None:
+        self.blocks.append((start, content))
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        if whence == 1:
+            offset += self.position
+        elif whence == 2:
+            offset += self.size
+        self.position = max(offset, 0)
+        return self.position
+
+    def tell(self) -> int:
+        return self.position
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        end = self.size if size < 0 else min(self.position + size, self.size)
+        if end <= self.position:
+            return b''
+        for start, content in self.blocks:
+            if start <= self.position and end <= start + len(content):
+                result = content[self.position - start:end - start]
+                self.position = end
+                return result
+        raise MissedRangeError(self.position, end)
+
+
+@attr.s()
+class RemoteZip:
+    """Zip archive on the server that supports HTTP range requests.
+
+    Only the central directory and the required members are fetched.
+    If the server doesn't support ranges, the whole archive is downloaded
+    with the first request, but only if it isn't bigger than `limit`.
+    """
+    url = attr.ib(type=str)
+    auth = attr.ib(default=None)
+    limit = attr.ib(type=int, default=FULL_SIZE_LIMIT)
+
+    requests = attr.ib(type=int, default=0, init=False)
+    _file = attr.ib(type=Optional[SparseFile], default=None, init=False, repr=False)
+
+    async def read(self, predicate: Callable[[str], bool]) -> Tuple[str, bytes]:
+        """Get name and content of the first member that matches the predicate.
+
+        Raises KeyError if there is no such member
+        and RangesNotSupportedError if the archive cannot be fetched in parts.
+        """
+        async with aiohttp_session(auth=self.auth) as session:
+            await self._fetch(session=session)
+            for _ in range(MAX_REQUESTS):
+                try:
+                    return self._read(predicate)
+                except MissedRangeError as e:
+                    await self._fetch(session=session, start=e.start, end=e.end)
+        raise LookupError('too many requests to read the archive', self.url)
+
+    def _read(self, predicate: Callable[[str], bool]) -> Tuple[str, bytes]:
+        with ZipFile(self._file) as archive:
+            for name in archive.namelist():
+                if predicate(name):
+                    return name, archive.read(name)
+        raise KeyError('no matching member in the archive')
+
+    async def _fetch(self, session, start: Optional[int] = None, end: Optional[int] = None) -> None:
+        if start is None:
+            headers = dict(Range='bytes=-{}'.format(TAIL_SIZE))
+        else:
+            end = min(max(end, start + MIN_RANGE_SIZE), self._file.size)
+            headers = dict(Range='bytes={}-{}'.format(start, end - 1))
+
+        self.requests += 1
+        async with session.get(self.url, headers=headers) as response:
+            response.raise_for_status()
+            match = REX_CONTENT_RANGE.fullmatch(response.headers.get('Content-Range', ''))
+            if response.status == 206 and match is not None:
+                content = await response.read()
+            else:
+                logger.debug('range requests are not supported', extra=dict(url=self.url))
+                content = await self._read_full(response)
+
+        if match is None or response.status != 206:
+            self._file = SparseFile(size=len(content))
+            self._file.add(0, content)
+            return
+        if self._file is None:
+            self._file = SparseFile(size=int(match.group(3)))
+        self._file.add(int(match.group(1)), content)
+
+    async def _read_full(self, response) -> bytes:
+        if response.content_length is not None and response.content_length > self.limit:
+            raise RangesNotSupportedError(self.url)
+        chunks = []
+        size = 0
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > self.limit:
+                raise RangesNotSupportedError(self.url)
+        return b''.join(chunks)
@@ -21,7 +21,7 @@ from ...constants import ARCHIVE_EXTENSIONS
 from ...exceptions import PackageNotFoundError
 from ...imports import lazy_import
 from ...models.release import Release
-from ...networking import requests_session
+from ...networking import get_conditional_headers, get_validators, requests_session
 from ._base import WarehouseBaseRepo
 
 
@@ -160,9 +160,17 @@ class WarehouseSimpleRepo(WarehouseBaseRepo):
             return
 
         dep_url = posixpath.join(self.url, quote(name)) + '/'
+        # revalidate expired entry instead of downloading it again
+        stale = cache.load_stale()
+        headers = get_conditional_headers(cache.validators.load()) if stale is not None else dict()
         with requests_session() as session:
             logger.debug('getting dep info from simple repo', extra=dict(url=dep_url))
-            response = session.get(dep_url, auth=self.auth)
+            response = session.get(dep_url, auth=self.auth, headers=headers)
+        if response.status_code == 304 and stale is not None:
+            logger.debug('links not modified', extra=dict(url=dep_url))
+            cache.touch()
+            yield from stale
+            return
         if response.status_code == 404:
             raise PackageNotFoundError(package=name, url=dep_url)
         response.raise_for_status()
@@ -179,16 +187,22 @@ class WarehouseSimpleRepo(WarehouseBaseRepo):
 
             python = tag.get('data-requires-python')
             fragment = parse_qs(parsed.fragment)
+            # PEP 714 renamed the PEP 658 attribute
+            metadata = tag.get('data-core-metadata')
+            if metadata is None:
+                metadata = tag.get('data-dist-info-metadata')
             link = dict(
                 url=urljoin(dep_url, link),
                 name=parsed.path.strip('/').split('/')[-1],
                 python=html.unescape(python) if python else '*',
                 digest=fragment['sha256'][0] if 'sha256' in fragment else None,
+                metadata=self._parse_metadata_flag(metadata),
             )
             links.append(link)
             yield link
 
         cache.dump(links)
+        cache.validators.dump(get_validators(response.headers))
         return links
 
     async def _get_deps_from_links(self, name: str, version):
@@ -205,6 +219,15 @@ class WarehouseSimpleRepo(WarehouseBaseRepo):
                 continue
             good_links.append(link)
 
+        # PEP 658: the index can serve metadata of wheels, so we don't need to download them
+        for link in good_links:
+            if not link['name'].endswith('.whl') or link.get('metadata') is None:
+                continue
+            deps = await self._get_deps_from_metadata(url=link['url'], digest=link['metadata'])
+            if deps is not None:
+                return deps
+            break
+
         sdist = SDistConverter()
         wheel = WheelConverter()
         rules = (
@@ -0,0 +1,87 @@
+# built-in
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+# project
+from benchmarks.dependency_copy import run_universe as run_copy
+from benchmarks.importtime import get_extra_commands, parse_importtime
+from benchmarks.resolver import main, record_universe, run_universe
+from dephell.controllers import Graph, Mutator, Resolver
+
+# app
+from .helpers import Fake, make_root
+
+
+UNIVERSE = Path(__file__).parent.parent / 'benchmarks' / 'universes' / 'small.json'
+
+
+def test_run_universe(temp_path: Path):
+    output = temp_path / 'results.json'
+    assert main([str(UNIVERSE), '--repeat', '1', '--output', str(output)]) == 0
+    results = json.loads(output.read_text())['results']
+    assert len(results) == 1
+    result = results[0]
+    assert result['universe'] == 'small'
+    assert result['resolved'] is True
+    assert result['calls']['releases'] == result['packages']
+    assert result['peak_memory'] > 0
+
+
+def test_record_universe():
+    root = make_root(
+        root=Fake('', 'a'),
+        a=(
+            Fake('1.0', 'b<2'),
+            Fake('2.0', 'b>=2'),
+        ),
+        b=(
+            Fake('1.0'),
+            Fake('2.0'),
+        ),
+    )
+    resolver = Resolver(graph=Graph(root), mutator=Mutator())
+    with patch(
+        target='dephell.controllers._dependency.get_repo',
+        return_value=resolver.graph._roots[0].repo,
+    ):
+        assert resolver.resolve(silent=True)
+
+    data = record_universe(resolver)
+    assert data['root'] == ['a']
+    assert data['packages']['a']['2.0']['deps'] == ['b>=2']
+    # recorded universe can be replayed
+    result = run_universe(data)
+    assert result['resolved'] is True
+    assert result['packages'] == 2
+
+
+def test_dependency_copy():
+    result = run_copy(json.loads(UNIVERSE.read_text()), number=2)
+    assert result['resolved'] is True
+    assert result['deps'] > 0
+    assert result['copy'] > 0
+
+
+def test_parse_importtime():
+    output = '\n'.join([
+        'import time: self [us] | cumulative | imported package',
+        'import time:       120 |        120 |   attr',
+        'import time:        30 |         30 |     dephell.commands.base',
+        'import time:        50 |         50 |     dephell.commands.discover',
+        'import time:       300 |        500 |   dephell.commands.inspect_self',
+        'some other line',
+    ])
+    result = parse_importtime(output)
+    assert result['modules'] == 4
+    assert result['time'] == 0.0005
+    assert result['commands'] == [
+        'dephell.commands.base',
+        'dephell.commands.discover',
+        'dephell.commands.inspect_self',
+    ]
+
+    result['command'] = 'inspect self'
+    assert get_extra_commands(result) == []
+    result['command'] = 'deps convert'
+    assert get_extra_commands(result) == ['dephell.commands.inspect_self']
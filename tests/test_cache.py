@@ -0,0 +1,142 @@
+# built-in
+import os
+from time import time
+from unittest.mock import patch
+
+# external
+import pytest
+
+# project
+from dephell import cache
+from dephell.cache import (
+    STORE_NAME, JSONCache, Memo, SQLiteStore, TextCache, batch, get_store, load_many, memo,
+)
+from dephell.config import config
+
+
+@pytest.fixture()
+def sqlite_cache(temp_path):
+    config.attach({'cache': {'path': str(temp_path), 'backend': 'sqlite'}})
+    yield temp_path
+    config.attach({'cache': {'backend': 'files'}})
+
+
+@pytest.mark.parametrize('cache_class, data', [
+    (JSONCache, {'a': [1, 2, 3]}),
+    (TextCache, ['a', 'b', 'c']),
+])
+def test_sqlite_load_dump(sqlite_cache, cache_class, data):
+    cache = cache_class('some', 'key')
+    assert cache.load() is None
+    cache.dump(data)
+    assert cache_class('some', 'key').load() == data
+    assert (sqlite_cache / 'cache.sqlite3').exists()
+    assert not (sqlite_cache / 'some').exists()
+
+
+def test_sqlite_ttl(sqlite_cache):
+    JSONCache('releases', 'name').dump([1])
+    store = get_store()
+    store.set('releases/name.json', b'[1]', mtime=time() - 100)
+    assert JSONCache('releases', 'name', ttl=1000).load() == [1]
+    assert JSONCache('releases', 'name', ttl=10).load() is None
+    # expired entry is kept for revalidation
+    cache = JSONCache('releases', 'name', ttl=10)
+    assert cache.load_stale() == [1]
+    cache.touch()
+    assert cache.load() == [1]
+
+
+def test_sqlite_batch(sqlite_cache):
+    with batch():
+        TextCache('deps', 'a').dump(['a'])
+        TextCache('deps', 'b').dump(['b'])
+        # pending entries are visible
+        assert TextCache('deps', 'a').load() == ['a']
+    caches = [TextCache('deps', name) for name in 'abc']
+    assert load_many(caches) == [['a'], ['b'], None]
+
+
+def test_migrate(temp_path):
+    config.attach({'cache': {'path': str(temp_path), 'backend': 'files'}})
+    JSONCache('warehouse-api', 'releases', 'dephell').dump({'a': 1})
+    TextCache('warehouse-api', 'deps', 'dephell', '0.1.0').dump(['attrs'])
+    repo_file = temp_path / 'git' / 'github.com' / 'repo' / 'dephell' / 'data.json'
+    repo_file.parent.mkdir(parents=True)
+    repo_file.write_text('{}')
+    old_time = time() - 50
+    os.utime(str(temp_path / 'warehouse-api' / 'releases' / 'dephell.json'), (old_time, old_time))
+
+    config.attach({'cache': {'backend': 'sqlite'}})
+    try:
+        assert JSONCache('warehouse-api', 'releases', 'dephell').load() == {'a': 1}
+        assert TextCache('warehouse-api', 'deps', 'dephell', '0.1.0').load() == ['attrs']
+        # mtime is preserved
+        assert JSONCache('warehouse-api', 'releases', 'dephell', ttl=10).load() is None
+    finally:
+        config.attach({'cache': {'backend': 'files'}})
+
+    assert not (temp_path / 'warehouse-api').exists()
+    assert repo_file.exists()
+
+
+def test_migrate_chunks(temp_path, monkeypatch):
+    (temp_path / 'releases').mkdir()
+    for name in 'abc':
+        (temp_path / 'releases' / (name + '.json')).write_text(name * 10)
+    store = SQLiteStore(path=temp_path / STORE_NAME)
+    chunks = []
+    set_many = store.set_many
+
+    def count_and_set(items):
+        items = list(items)
+        chunks.append(len(items))
+        set_many(items)
+
+    monkeypatch.setattr(cache, 'MIGRATE_CHUNK_SIZE', 20)
+    monkeypatch.setattr(store, 'set_many', count_and_set)
+    assert store.migrate(temp_path) == 3
+    assert chunks == [2, 1]
+    assert store.get('releases/c.json')[0] == b'cccccccccc'
+    assert not (temp_path / 'releases').exists()
+
+
+def test_migrate_empty(temp_path):
+    store = SQLiteStore(path=temp_path / STORE_NAME)
+    assert store.migrate(temp_path) == 0
+    # the database is created, so the tree isn't walked again
+    assert (temp_path / STORE_NAME).exists()
+
+
+def test_memo():
+    cache = Memo(maxsize=2)
+    cache.set('ns', 'a', 1)
+    cache.set('ns', 'b', 2)
+    assert cache.get('ns', 'a') == 1
+    cache.set('ns', 'c', 3)
+    # `b` is the least recently used
+    assert cache.get('ns', 'b') is None
+    assert cache.get('other', 'a') is None
+    assert cache.get('ns', 'c') == 3
+    assert cache.stats == dict(hits=2, misses=2, size=2)
+
+
+@pytest.mark.parametrize('backend', ['files', 'sqlite'])
+def test_memo_cache(temp_path, backend):
+    config.attach({'cache': {'path': str(temp_path), 'backend': backend}})
+    try:
+        JSONCache('releases', 'name').dump({'a': 1})
+        with patch.object(JSONCache, '_decode', side_effect=JSONCache._decode, autospec=True) as decode:
+            assert JSONCache('releases', 'name').load() == {'a': 1}
+            assert JSONCache('releases', 'name', ttl=1000).load() == {'a': 1}
+            assert load_many([JSONCache('releases', 'name')]) == [{'a': 1}]
+            assert decode.call_count == 1
+
+            # dump invalidates the memo
+            hits = memo.hits
+            JSONCache('releases', 'name').dump({'a': 2})
+            assert JSONCache('releases', 'name').load() == {'a': 2}
+            assert decode.call_count == 2
+            assert memo.hits == hits
+    finally:
+        config.attach({'cache': {'backend': 'files'}})
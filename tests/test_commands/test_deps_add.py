@@ -1,5 +1,6 @@
 # built-in
 from pathlib import Path
+from unittest.mock import Mock, patch
 
 # external
 import pytest
@@ -7,6 +8,11 @@ import pytest
 # project
 from dephell.commands import DepsAddCommand
 from dephell.config import Config
+from dephell.controllers import Graph, Mutator, Resolver
+from dephell.converters import PIPConverter
+
+# app
+from ..helpers import Fake, make_root
 
 
 @pytest.mark.allow_hosts()
@@ -31,3 +37,63 @@ def test_deps_add_command(temp_path: Path, capsys):
     assert result is True
 
     assert set(reqs_path.read_text().split()) == {'six==1.12.0', 'jinja2==2.0'}
+
+
+@pytest.mark.allow_hosts()
+def test_deps_add_upgrades_locked_dependency(temp_path: Path):
+    reqs_path = temp_path / 'requirements.in'
+    reqs_path.write_text('markupsafe')
+    lock_path = temp_path / 'requirements.txt'
+    lock_path.write_text('markupsafe==1.1.1\n')
+
+    config = Config()
+    config.attach({
+        'level': 'WARNING',
+        'silent': True,
+        'nocolors': True,
+        'from': dict(format='pip', path=str(reqs_path)),
+        'to': dict(format='piplock', path=str(lock_path)),
+    })
+
+    # jinja2 3.0 requires markupsafe>=2.0
+    command = DepsAddCommand(argv=['jinja2==3.0.0'], config=config)
+    result = command()
+    assert result is True
+
+    root = PIPConverter(lock=True).load(lock_path)
+    locked = {dep.name: str(dep.constraint) for dep in root.dependencies}
+    assert locked['jinja2'] == '==3.0.0'
+    assert not locked['markupsafe'].startswith('==1.')
+
+
+def test_update_lockfile_unpins_dependencies(temp_path: Path):
+    lock_path = temp_path / 'requirements.txt'
+    lock_path.write_text('b==1.0\nc==1.0\nd==1.0\n')
+    root = make_root(
+        root=Fake('', 'a', 'c'),
+        a=(Fake('1.0', 'b>=2'), ),
+        b=(Fake('1.0', 'd'), Fake('2.0', 'd')),
+        c=(Fake('1.0', 'b'), Fake('2.0', 'b')),
+        d=(Fake('1.0'), Fake('2.0')),
+    )
+    resolver = Resolver(graph=Graph(root), mutator=Mutator())
+    converter = Mock(load_resolver=Mock(return_value=resolver))
+
+    config = Config()
+    config.attach({
+        'level': 'WARNING',
+        'silent': True,
+        'from': dict(format='pip', path=str(temp_path / 'requirements.in')),
+        'to': dict(format='piplock', path=str(lock_path)),
+    })
+    command = DepsAddCommand(argv=['a'], config=config)
+    with patch(
+        target='dephell.controllers._dependency.get_repo',
+        return_value=resolver.graph._roots[0].repo,
+    ), patch.object(resolver, 'reset', side_effect=AssertionError('resolved from scratch')):
+        assert command._update_lockfile(converter=converter, names={'a'})
+
+    versions = {dep.name: str(dep.group.best_release.version) for dep in resolver.graph}
+    # `a` needs new `b`, `b` and `d` are unpinned, `c` is kept
+    assert versions == {'a': '1.0', 'b': '2.0', 'c': '1.0', 'd': '2.0'}
+    assert 'b==2.0' in lock_path.read_text()
@@ -1,8 +1,11 @@
 # built-in
 from pathlib import Path
 
+# external
+import pytest
+
 # project
-from dephell.commands import DepsConvertCommand
+from dephell.commands import DepsCheckCommand, DepsConvertCommand
 from dephell.config import Config
 
 
@@ -39,3 +42,11 @@ def test_convert_to_stdout(temp_path: Path, requirements_path: Path, capsys):
     captured = capsys.readouterr()
     assert 'setup(' in captured.out
     assert 'The description of the package' in captured.out
+
+
+def test_targets_only_for_convert():
+    command = DepsConvertCommand(argv=['--targets', '3.8:linux', '3.10'])
+    assert command.args.targets == ['3.8:linux', '3.10']
+    # other commands don't support targets, so they don't accept the option
+    with pytest.raises(SystemExit):
+        DepsCheckCommand(argv=['--targets', '3.8:linux']).args
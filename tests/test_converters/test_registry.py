@@ -0,0 +1,52 @@
+# built-in
+from pathlib import Path
+
+# external
+import pytest
+
+# project
+from dephell.converters import CONVERTERS, PIPConverter
+from dephell.converters.registry import INFOS
+
+
+root_path = Path(__file__).parent.parent / 'requirements'
+
+
+@pytest.mark.parametrize('name, content, expected', [
+    ('Pipfile', None, ['pipfile']),
+    ('Pipfile.lock', None, ['pipfilelock']),
+    ('poetry.lock', None, ['poetrylock']),
+    ('setup.py', None, ['setuppy']),
+    ('environment.yml', None, ['conda']),
+    ('requirements-dev.txt', None, ['pip']),
+    ('pyproject.toml', '[tool.flit.metadata]\nmodule = "a"', ['flit']),
+    ('pyproject.toml', '[tool.poetry]\nname = "a"', ['poetry']),
+    ('deps.toml', '[[source]]\n[packages]', ['pipfile']),
+    ('README.md', None, []),
+])
+def test_detect(temp_path: Path, name: str, content, expected):
+    path = temp_path / name
+    path.write_text(content or '')
+    assert [name for name, _ in CONVERTERS.detect(path=path, content=content)] == expected
+
+
+@pytest.mark.parametrize('path', [
+    root_path / fname for fname in sorted(p.name for p in root_path.iterdir())
+] + [root_path / 'egg-info' / 'PKG-INFO', root_path / 'egg-info' / 'setup.py'])
+def test_hints_cover_can_parse(path: Path):
+    content = None
+    if path.is_file() and path.suffix in ('.txt', '.toml', '.json', '.py', ''):
+        content = path.read_text()
+    for name, info in INFOS.items():
+        if CONVERTERS[name].can_parse(path=path, content=content):
+            assert info.match(path=path, content=content), name
+
+
+def test_lazy_access():
+    assert set(CONVERTERS) == set(INFOS)
+    assert isinstance(CONVERTERS['piplock'], PIPConverter)
+    assert CONVERTERS['piplock'].lock is True
+    assert CONVERTERS['pip'].lock is False
+    assert CONVERTERS['pip'] is CONVERTERS['pip']
+    with pytest.raises(KeyError):
+        CONVERTERS['unknown']
@@ -1,5 +1,8 @@
 # built-in
+import tarfile
+from io import BytesIO
 from pathlib import Path
+from zipfile import ZipFile
 
 # project
 from dephell.converters import SDistConverter
@@ -21,3 +24,44 @@ def test_load_metadata(requirements_path: Path):
     assert root.version == '0.2.0'
     assert root.authors[0].name == 'orsinium'
     assert not root.license
+
+
+def test_load_zip(requirements_path: Path, temp_path: Path):
+    path = temp_path / 'dephell-0.2.0.zip'
+    with tarfile.open(str(requirements_path / 'sdist.tar.gz')) as tar, ZipFile(str(path), 'w') as archive:
+        for info in tar.getmembers():
+            if info.isfile():
+                archive.writestr(info.name, tar.extractfile(info).read())
+
+    root = SDistConverter().load(path)
+    assert root.name == 'dephell'
+    needed = {'attrs', 'cached-property', 'packaging', 'requests'}
+    assert {dep.name for dep in root.dependencies} == needed
+
+
+def test_load_shallowest_egg_info(temp_path: Path):
+    path = temp_path / 'pkg-0.1.0.tar.gz'
+    files = [
+        # a deeper egg-info goes first in the archive
+        ('pkg-0.1.0/src/other.egg-info/PKG-INFO', 'Metadata-Version: 2.1\nName: other\nVersion: 0.2.0\n'),
+        ('pkg-0.1.0/src/other.egg-info/requires.txt', 'six\n'),
+        ('pkg-0.1.0/pkg.egg-info/PKG-INFO', 'Metadata-Version: 2.1\nName: pkg\nVersion: 0.1.0\n'),
+        ('pkg-0.1.0/pkg.egg-info/requires.txt', 'attrs\n'),
+        ('pkg-0.1.0/pkg.egg-info/entry_points.txt', '[console_scripts]\npkg = pkg:main\n'),
+    ]
+    with tarfile.open(str(path), mode='w:gz') as archive:
+        for name, content in files:
+            info = tarfile.TarInfo(name)
+            info.size = len(content.encode())
+            archive.addfile(info, BytesIO(content.encode()))
+
+    root = SDistConverter().load(path)
+    assert root.name == 'pkg'
+    assert {dep.name for dep in root.dependencies} == {'attrs'}
+    assert [entrypoint.name for entrypoint in root.entrypoints] == ['pkg']
+
+
+def test_load_package(requirements_path: Path, temp_path: Path):
+    root = SDistConverter(project_path=temp_path).load(requirements_path / 'sdist.tar.gz')
+    assert root.package.name == 'dephell'
+    assert root.package.path == temp_path
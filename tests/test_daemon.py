@@ -0,0 +1,115 @@
+# built-in
+import socket
+import sys
+from pathlib import Path
+from threading import Thread
+
+# external
+import pytest
+
+# project
+from dephell import daemon
+from dephell.config import config
+from dephell.networking import retry_policy
+
+# app
+from .conftest import true_socket
+
+
+@pytest.fixture
+def unix_socket(monkeypatch):
+    # sockets are blocked in tests to prevent network access
+    monkeypatch.setattr(socket, 'socket', true_socket)
+
+
+def test_forward_not_running(temp_path: Path):
+    assert daemon.forward(['deps', 'check'], path=temp_path / 'dephell.sock') is None
+
+
+@pytest.mark.parametrize('argv', [
+    ['venv', 'shell'],
+    ['generate', 'config'],
+    [],
+])
+def test_forward_not_forwarded(argv, temp_path: Path):
+    path = temp_path / 'dephell.sock'
+    path.touch()
+    assert daemon.forward(argv, path=path) is None
+
+
+def test_forward(temp_path: Path, capsys, unix_socket):
+    path = temp_path / 'dephell.sock'
+    requests = []
+
+    def handle(server):
+        connection, _ = server.accept()
+        with connection:
+            requests.append(daemon._read_message(connection))
+            daemon._send_message(connection, dict(code=3, stdout='out\n', stderr='err\n'))
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(str(path))
+        server.listen()
+        thread = Thread(target=handle, args=(server, ))
+        thread.start()
+        code = daemon.forward(['deps-check', '--silent'], path=path)
+        thread.join()
+
+    assert code == 3
+    assert requests[0]['argv'] == ['deps-check', '--silent']
+    captured = capsys.readouterr()
+    assert captured.out == 'out\n'
+    assert captured.err == 'err\n'
+
+
+def test_run(temp_path: Path, unix_socket):
+    result = daemon.run(
+        argv=['inspect', 'config', '--nocolors', '--filter', 'prereleases'],
+        cwd=str(temp_path),
+        env={'DEPHELL_PRERELEASES': 'true'},
+    )
+    assert result['code'] == 0
+    assert result['stdout'].strip() == 'True'
+    assert config['prereleases'] is False
+
+
+def test_forward_foreign_socket(temp_path: Path, monkeypatch, unix_socket):
+    path = temp_path / 'dephell.sock'
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(str(path))
+        server.listen()
+        server.setblocking(False)
+        monkeypatch.setattr(daemon.os, 'getuid', lambda: path.stat().st_uid + 1)
+        assert daemon.forward(['deps', 'check'], path=path) is None
+        # the client hasn't connected
+        with pytest.raises(BlockingIOError):
+            server.accept()
+
+
+def test_get_socket_path(monkeypatch):
+    monkeypatch.setenv('XDG_RUNTIME_DIR', '/run/user/1000')
+    assert daemon.get_socket_path() == Path('/run/user/1000', 'dephell.sock')
+    monkeypatch.delenv('XDG_RUNTIME_DIR')
+    assert daemon.get_socket_path().parent.name == 'dephell-{}'.format(daemon.os.getuid())
+
+
+def test_run_resets_retry_budget(temp_path: Path, unix_socket):
+    retry_policy.spend('timeout')
+    daemon.run(argv=['inspect', 'config', '--nocolors'], cwd=str(temp_path), env={})
+    assert retry_policy.stats['retries'] == 0
+
+
+def test_run_another_python(temp_path: Path):
+    result = daemon.run(argv=['inspect', 'config'], cwd=str(temp_path), env={}, python='/usr/bin/python0')
+    assert result['code'] is None
+
+
+def test_run_forwards_venv(temp_path: Path, monkeypatch, unix_socket):
+    monkeypatch.setenv('VIRTUAL_ENV', '/daemon/venv')
+    environ = []
+    monkeypatch.setattr('dephell.cli.main', lambda argv: environ.append(dict(daemon.os.environ)) or 0)
+    daemon.run(argv=['deps', 'check'], cwd=str(temp_path), env={'PATH': '/client/bin'}, python=sys.executable)
+    # the daemon's venv isn't active for a client without venv
+    assert 'VIRTUAL_ENV' not in environ[0]
+    assert environ[0]['PATH'] == '/client/bin'
+    assert daemon.os.environ['VIRTUAL_ENV'] == '/daemon/venv'
@@ -0,0 +1,83 @@
+# built-in
+from datetime import datetime
+
+# external
+import pytest
+
+# project
+from dephell.models import Constraint, Release, RootDependency
+
+
+VERSIONS = (
+    '0.9', '1.0.dev1', '1.0a1', '1.0rc1', '1.0', '1.0+local', '1.0.post1',
+    '1.1', '1.2.3', '2.0b1', '2.0', '2.0.1', '3.0', 'lol',
+)
+
+
+def make_releases():
+    return [
+        Release(raw_name='pkg', version=version, time=datetime(1970, 1, 1, 0, 0))
+        for version in VERSIONS
+    ]
+
+
+def naive_filter(constraint, releases):
+    result = set()
+    for release in releases:
+        if all(release in spec for spec in constraint._specs.values()):
+            result.add(release)
+    return result
+
+
+@pytest.mark.parametrize('spec', [
+    '',
+    '>=1.0',
+    '>1.0',
+    '<2.0',
+    '<=1.0',
+    '>=1.0,<2.0',
+    '>1.0,<=2.0,!=1.1',
+    '==1.0',
+    '==1.*',
+    '!=1.*',
+    '~=1.0',
+    '<1.0 || >=2.0',
+    '>=1.0,<1.1 || ==3.0',
+    '>=3.0,<1.0',
+])
+def test_filter(spec):
+    constraint = Constraint(RootDependency(), spec)
+    releases = make_releases()
+    assert constraint.filter(releases) == naive_filter(constraint, releases)
+    # the order of releases doesn't matter
+    assert constraint.filter(releases[::-1]) == naive_filter(constraint, releases)
+    # releases sorted by version in any direction aren't sorted again
+    assert constraint.filter(releases, ordered=True) == naive_filter(constraint, releases)
+    assert constraint.filter(releases[::-1], ordered=True) == naive_filter(constraint, releases)
+
+
+def test_filter_recompiled_on_change():
+    root = RootDependency()
+    constraint = Constraint(root, '>=1.0')
+    releases = make_releases()
+    assert len(constraint.filter(releases)) == 9
+
+    other = Constraint(RootDependency(raw_name='other'), '<2.0')
+    constraint &= other
+    assert {str(release.version) for release in constraint.filter(releases)} == {
+        '1.0', '1.0+local', '1.0.post1', '1.1', '1.2.3',
+    }
+
+    constraint.unapply('other')
+    assert len(constraint.filter(releases)) == 9
+
+
+@pytest.mark.parametrize('spec', ['>1.0,<=2.0,!=1.1', '<1.0 || >=2.0', '==1.*'])
+def test_filter_does_not_parse_time(spec):
+    constraint = Constraint(RootDependency(), spec)
+    releases = [
+        Release(raw_name='pkg', version=version, time='2019-01-01T00:00:00')
+        for version in VERSIONS
+    ]
+    assert constraint.filter(releases)
+    assert all(isinstance(release._time, str) for release in releases)
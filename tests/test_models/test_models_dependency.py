@@ -5,6 +5,9 @@ from packaging.requirements import Requirement
 from dephell.controllers import DependencyMaker
 from dephell.models import RootDependency
 
+# app
+from ..helpers import Fake, make_root
+
 
 def test_from_requirement():
     root = RootDependency()
@@ -12,3 +15,28 @@ def test_from_requirement():
     dep = DependencyMaker.from_requirement(source=root, req=req)[0]
     assert dep.raw_name == 'Django'
     assert set(str(dep.constraint).split(',')) == {'>=1.5', '<=1.9'}
+
+
+def test_copy():
+    root = make_root(
+        root=Fake('', 'a>=1'),
+        a=(Fake('1.0'), Fake('2.0')),
+    )
+    dep = root.dependencies[0]
+    assert dep.group.best_release.version.public == '2.0'
+    dep.envs.add('dev')
+
+    new = dep.copy()
+    assert not new.locked
+    # releases are shared
+    assert new.repo is dep.repo
+    assert new.groups.releases is dep.groups.releases
+    assert new.groups.dep is new
+    # mutable state is copied
+    new.constraint.apply(RootDependency(raw_name='other'), '<2')
+    assert str(dep.constraint) == '>=1'
+    assert set(str(new.constraint).split(',')) == {'<2', '>=1'}
+    assert [len(group.releases) for group in new.groups] == [0, 1]
+    assert [len(group.releases) for group in dep.groups] == [1, 1]
+    new.envs.add('tests')
+    assert dep.envs == {'main', 'dev'}
@@ -53,3 +53,22 @@ def test_time_compare():
     spec = Specifier('==1.2.3')
     spec.attach_time([release])
     assert release in spec
+
+
+def test_lazy_parsing():
+    info = [{
+        'upload_time': '2018-09-11T12:13:00',
+        'requires_python': '>=3.5',
+        'digests': {'sha256': 'hash'},
+        'url': 'https://example.com/lol-1.2.3.tar.gz',
+    }]
+    release = Release.from_response(name='lol', version='1.2.3', info=info)
+    assert release._time == '2018-09-11T12:13:00'
+    assert release.time == datetime(2018, 9, 11, 12, 13)
+    assert release._time is release.time
+    assert '3.7' in release.python
+    assert release.dependencies is None
+    assert not hasattr(release, '__dict__')
+
+    other = Release.from_response(name='other', version='1.2.3', info=info)
+    assert other.version is release.version
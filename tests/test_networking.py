@@ -0,0 +1,106 @@
+# built-in
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import patch
+
+# external
+import pytest
+from aiohttp import ClientConnectionError, ClientResponseError
+
+# project
+from dephell.networking import RetryPolicy, aiohttp_repeat, aiohttp_session, get_connector, get_ssl_context
+
+
+loop = asyncio.get_event_loop()
+
+
+def make_response_error(status):
+    return ClientResponseError(request_info=None, history=(), status=status)
+
+
+def test_shared_connector():
+    async def check():
+        async with aiohttp_session() as session1:
+            connector = session1.connector
+        assert not connector.closed
+        async with aiohttp_session() as session2:
+            assert session2.connector is connector
+        assert connector is get_connector()
+        return connector
+
+    connector = loop.run_until_complete(check())
+    assert connector.limit_per_host > 0
+
+
+def test_ssl_context_reused():
+    assert get_ssl_context() is get_ssl_context()
+
+
+@pytest.mark.parametrize('exc, retry', [
+    (ClientConnectionError(), True),
+    (asyncio.TimeoutError(), True),
+    (make_response_error(503), True),
+    (make_response_error(429), True),
+    (make_response_error(404), False),
+    (ValueError(), False),
+])
+def test_should_retry(exc, retry):
+    assert RetryPolicy().should_retry(exc=exc) is retry
+
+
+def test_retry_after():
+    policy = RetryPolicy(cap=60)
+    assert policy.get_delay(1, retry_after='7') == 7
+    date = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=20), usegmt=True)
+    assert 10 < policy.get_delay(1, retry_after=date) <= 20
+    # jitter is bounded by exponential backoff
+    assert 0 <= policy.get_delay(3) <= policy.base * 4
+
+
+def test_aiohttp_repeat():
+    calls = []
+
+    @aiohttp_repeat(count=3)
+    async def func():
+        calls.append(1)
+        if len(calls) < 3:
+            raise make_response_error(502)
+        return 'ok'
+
+    policy = RetryPolicy(base=0)
+    with patch('dephell.networking.retry_policy', policy):
+        assert loop.run_until_complete(func()) == 'ok'
+    assert len(calls) == 3
+    assert policy.stats['retries'] == 2
+    assert policy.stats['status_502'] == 2
+
+
+def test_aiohttp_repeat_budget():
+    calls = []
+
+    @aiohttp_repeat
+    async def func():
+        calls.append(1)
+        raise ClientConnectionError()
+
+    policy = RetryPolicy(base=0, budget=1)
+    with patch('dephell.networking.retry_policy', policy):
+        with pytest.raises(ClientConnectionError):
+            loop.run_until_complete(func())
+    assert len(calls) == 2
+    assert policy.stats['exhausted'] == 1
+
+
+@pytest.mark.parametrize('stats, level', [
+    (dict(), None),
+    (dict(retries=2, status_502=2), 'info'),
+    (dict(retries=1, ClientConnectionError=1, exhausted=1), 'warning'),
+])
+def test_retry_policy_report(stats, level):
+    policy = RetryPolicy()
+    policy.stats.update(stats)
+    with patch('dephell.networking.logger') as logger:
+        policy.report()
+    calls = [(name, kwargs['extra']) for name, _, kwargs in logger.method_calls]
+    assert calls == ([(level, stats)] if level else [])
@@ -1,17 +1,28 @@
 # built-in
 import asyncio
 import json
+import os
+import threading
 from pathlib import Path
+from time import time
+from unittest.mock import patch
+from zipfile import ZIP_STORED, ZipFile
 
 # external
 import pytest
+from aioresponses import CallbackResult
 from packaging.version import Version
 
 # project
+from dephell.cache import JSONCache
+from dephell.config import config
 from dephell.constants import DEFAULT_WAREHOUSE
 from dephell.controllers import DependencyMaker
+from dephell.converters import WheelConverter
 from dephell.models import Auth, RootDependency
 from dephell.repositories import WarehouseAPIRepo
+from dephell.repositories._warehouse import _remote_zip as remote_zip
+from dephell.repositories._warehouse._base import run_parser
 
 
 loop = asyncio.get_event_loop()
@@ -59,6 +70,29 @@ def test_get_releases(requests_mock, temp_cache, fixtures_path: Path):
     assert len(releases) == 4
 
 
+def test_get_releases_revalidate(requests_mock, temp_cache, fixtures_path: Path):
+    url = 'https://pypi.org/pypi/'
+    text = (fixtures_path / 'warehouse-api-package.json').read_text()
+    requests_mock.get(url + 'dephell-shells/json', text=text, headers={'ETag': '"abc"'})
+
+    root = RootDependency()
+    dep = DependencyMaker.from_requirement(source=root, req='dephell-shells')[0]
+    repo = WarehouseAPIRepo(name='pypi', url=url)
+    repo.get_releases(dep=dep)
+
+    # make the cache entry expired
+    cache = JSONCache('warehouse-api', 'pypi.org', 'releases', 'dephell-shells')
+    old_time = time() - 7200
+    os.utime(str(cache.path), (old_time, old_time))
+
+    requests_mock.get(url + 'dephell-shells/json', status_code=304)
+    releases = repo.get_releases(dep=dep)
+    assert requests_mock.call_count == 2
+    assert requests_mock.last_request.headers['If-None-Match'] == '"abc"'
+    assert len(releases) == 4
+    assert cache.path.stat().st_mtime > old_time
+
+
 def test_get_releases_auth(requests_mock, temp_cache, fixtures_path: Path):
     url = 'https://custom.pypi.org/pypi/'
     text = (fixtures_path / 'warehouse-api-package.json').read_text()
@@ -111,6 +145,97 @@ def test_get_deps_auth(asyncio_mock, temp_cache, fixtures_path: Path):
     assert client._default_headers['authorization'] == 'Basic Z3JhbTp0ZXN0'
 
 
+def test_get_deps_from_metadata(asyncio_mock, temp_cache, fixtures_path: Path):
+    url = 'https://pypi.org/pypi/'
+    data = json.loads((fixtures_path / 'warehouse-api-release.json').read_text())
+    data['info']['requires_dist'] = None
+    asyncio_mock.get(url + 'dephell-shells/0.1.2/json', body=json.dumps(data))
+    wheel_url = [info['url'] for info in data['urls'] if info['packagetype'] == 'bdist_wheel'][0]
+    metadata = 'Metadata-Version: 2.1\nName: dephell-shells\nRequires-Dist: attrs\n'
+    asyncio_mock.get(wheel_url + '.metadata', body=metadata)
+
+    repo = WarehouseAPIRepo(name='pypi', url=url)
+    coroutine = repo.get_dependencies(name='dephell-shells', version='0.1.2')
+    deps = loop.run_until_complete(asyncio.gather(coroutine))[0]
+    assert [dep.name for dep in deps] == ['attrs']
+    assert len(asyncio_mock.requests) == 2
+
+
+@pytest.mark.parametrize('status', [401, 403, 404])
+def test_get_deps_from_wheel_without_metadata(asyncio_mock, temp_cache, fixtures_path: Path,
+                                              requirements_path: Path, status: int):
+    url = 'https://pypi.org/pypi/'
+    data = json.loads((fixtures_path / 'warehouse-api-release.json').read_text())
+    data['info']['requires_dist'] = None
+    asyncio_mock.get(url + 'dephell-shells/0.1.2/json', body=json.dumps(data))
+    wheel_url = [info['url'] for info in data['urls'] if info['packagetype'] == 'bdist_wheel'][0]
+    # a mirror doesn't allow access to metadata files, let's read the wheel
+    asyncio_mock.get(wheel_url + '.metadata', status=status)
+    asyncio_mock.get(wheel_url, body=(requirements_path / 'wheel.whl').read_bytes())
+
+    repo = WarehouseAPIRepo(name='pypi', url=url)
+    coroutine = repo.get_dependencies(name='dephell-shells', version='0.1.2')
+    deps = loop.run_until_complete(asyncio.gather(coroutine))[0]
+    assert 'attrs' in {dep.name for dep in deps}
+
+
+@pytest.mark.parametrize('ranges', [True, False])
+def test_get_deps_from_wheel(asyncio_mock, monkeypatch, requirements_path: Path, ranges: bool):
+    monkeypatch.setattr(remote_zip, 'TAIL_SIZE', 1024)
+    monkeypatch.setattr(remote_zip, 'MIN_RANGE_SIZE', 512)
+    url = 'https://custom.pypi.org/packages/dephell-0.2.0-py3-none-any.whl'
+    content = (requirements_path / 'wheel.whl').read_bytes()
+
+    def callback(url, headers, **kwargs):
+        if not ranges:
+            return CallbackResult(body=content)
+        start, end = headers['Range'][len('bytes='):].split('-')
+        if not start:
+            start, end = len(content) - int(end), len(content) - 1
+        start, end = int(start), int(end)
+        return CallbackResult(
+            status=206,
+            body=content[start:end + 1],
+            headers={'Content-Range': 'bytes {}-{}/{}'.format(start, end, len(content))},
+        )
+
+    asyncio_mock.get(url, callback=callback, repeat=True)
+    repo = WarehouseAPIRepo(name='pypi', url='https://custom.pypi.org/pypi/')
+    coroutine = repo._get_deps_from_wheel(url=url, converter=WheelConverter())
+    deps = loop.run_until_complete(asyncio.gather(coroutine))[0]
+    assert 'attrs' in deps
+    requests = sum(len(calls) for calls in asyncio_mock.requests.values())
+    assert requests == (3 if ranges else 1)
+
+
+def test_get_deps_from_big_wheel_without_ranges(asyncio_mock, temp_path: Path, requirements_path: Path):
+    url = 'https://custom.pypi.org/packages/dephell-0.2.0-py3-none-any.whl'
+    path = temp_path / 'big.whl'
+    with ZipFile(str(requirements_path / 'wheel.whl')) as source, ZipFile(str(path), 'w') as target:
+        for name in source.namelist():
+            target.writestr(name, source.read(name))
+        target.writestr('dephell/data.bin', os.urandom(3 * 1024 * 1024), compress_type=ZIP_STORED)
+    content = path.read_bytes()
+    assert len(content) > remote_zip.FULL_SIZE_LIMIT
+
+    # the server ignores `Range` and sends the whole wheel
+    asyncio_mock.get(url, body=content, repeat=True)
+    repo = WarehouseAPIRepo(name='pypi', url='https://custom.pypi.org/pypi/')
+    coroutine = repo._get_deps_from_wheel(url=url, converter=WheelConverter())
+    with pytest.raises(FileNotFoundError):
+        loop.run_until_complete(asyncio.gather(coroutine))
+    requests = sum(len(calls) for calls in asyncio_mock.requests.values())
+    assert requests == 1
+
+
+@pytest.mark.parametrize('workers', [0, 2])
+def test_run_parser(workers: int):
+    with patch.dict(config._data, workers=workers):
+        coroutine = run_parser(threading.current_thread)
+        thread = loop.run_until_complete(asyncio.gather(coroutine))[0]
+    assert (thread is threading.main_thread()) is (workers == 0)
+
+
 @pytest.mark.parametrize('version', ['0.1.2', Version('0.1.2')])
 def test_download(asyncio_mock, temp_cache, fixtures_path: Path, temp_path: Path,
                   requirements_path: Path, version):
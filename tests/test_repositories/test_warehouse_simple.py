@@ -1,6 +1,7 @@
 # built-in
 import asyncio
 import re
+from hashlib import sha256
 from pathlib import Path
 from urllib.parse import urlparse
 
@@ -129,6 +130,46 @@ def test_get_deps_auth(requests_mock, temp_cache, fixtures_path):
     assert requests_mock.last_request.headers['Authorization'] == 'Basic Z3JhbTp0ZXN0'
 
 
+METADATA = """Metadata-Version: 2.1
+Name: dephell-shells
+Version: 0.1.2
+Requires-Dist: attrs
+Requires-Dist: pexpect
+Requires-Dist: shellingham ; extra == 'full'
+"""
+
+
+@pytest.mark.parametrize('attr_name', ['data-core-metadata', 'data-dist-info-metadata'])
+def test_get_deps_from_metadata(requests_mock, asyncio_mock, temp_cache, attr_name):
+    url = 'https://custom.pypi.org/'
+    file_url = 'https://files.example.com/dephell_shells-0.1.2-py3-none-any.whl'
+    digest = sha256(METADATA.encode()).hexdigest()
+    text = '<a href="{url}" {attr}="sha256={digest}">dephell_shells-0.1.2-py3-none-any.whl</a>'
+    text = text.format(url=file_url, attr=attr_name, digest=digest)
+    requests_mock.get(url + 'dephell-shells/', text=text)
+    # only metadata is available, the wheel itself isn't downloaded
+    asyncio_mock.get(file_url + '.metadata', body=METADATA)
+
+    repo = WarehouseSimpleRepo(name='pypi', url=url)
+    coroutine = repo.get_dependencies(name='dephell-shells', version='0.1.2')
+    deps = loop.run_until_complete(asyncio.gather(coroutine))[0]
+    assert {dep.name for dep in deps} == {'attrs', 'pexpect'}
+    coroutine = repo.get_dependencies(name='dephell-shells', version='0.1.2', extra='full')
+    deps = loop.run_until_complete(asyncio.gather(coroutine))[0]
+    assert {dep.name for dep in deps} == {'shellingham'}
+
+
+@pytest.mark.parametrize('value, expected', [
+    (None, None),
+    ('true', ''),
+    ('sha256=abc', 'abc'),
+    ({'sha256': 'abc'}, 'abc'),
+    (False, None),
+])
+def test_parse_metadata_flag(value, expected):
+    assert WarehouseSimpleRepo._parse_metadata_flag(value) == expected
+
+
 @pytest.mark.parametrize('version', ['0.1.2', Version('0.1.2')])
 def test_download(requests_mock, asyncio_mock, temp_cache, fixtures_path: Path,
                   temp_path: Path, requirements_path: Path, version):
@@ -0,0 +1,121 @@
+# built-in
+import sys
+from unittest.mock import patch
+
+# project
+from dephell.controllers import Graph, Mutator, Resolver
+
+# app
+from ..helpers import Fake, make_root
+
+
+def test_parents_and_children():
+    root = make_root(
+        root=Fake('', 'a', 'd'),
+        a=(Fake('1.0', 'b'), ),
+        b=(Fake('1.0', 'c'), ),
+        c=(Fake('1.0'), ),
+        d=(Fake('1.0', 'c'), ),
+    )
+    resolver = Resolver(graph=Graph(root), mutator=Mutator())
+    with patch(
+        target='dephell.controllers._dependency.get_repo',
+        return_value=resolver.graph._roots[0].repo,
+    ):
+        assert resolver.resolve(silent=True)
+    graph = resolver.graph
+
+    # the closest parents go first
+    assert list(graph.get_parents(graph.get('c'))) == ['d', 'b', root.name, 'a']
+    assert list(graph.get_parents(graph.get('b'))) == ['a', root.name]
+    assert set(graph.get_children(graph.get('a'))) == {'b', 'c'}
+    assert graph.get_children(graph.get('c')) == dict()
+
+    # unused deps are dropped from the index
+    resolver.unapply(graph.get('a'))
+    graph.clear()
+    assert set(graph.get_parents(graph.get('c'))) == {root.name, 'd'}
+
+
+def test_leafs():
+    root = make_root(
+        root=Fake('', 'a', 'b'),
+        a=(Fake('1.0', 'c'), ),
+        b=(Fake('1.0'), ),
+        c=(Fake('1.0'), ),
+    )
+    resolver = Resolver(graph=Graph(root), mutator=Mutator())
+    graph = resolver.graph
+    with patch(
+        target='dephell.controllers._dependency.get_repo',
+        return_value=graph._roots[0].repo,
+    ):
+        assert graph.get_leafs() == (root, )
+        resolver.apply(root)
+        assert [dep.name for dep in graph.get_leafs()] == ['a', 'b']
+        resolver.apply(graph.get('a'))
+        assert [dep.name for dep in graph.get_leafs()] == ['b', 'c']
+        assert [dep.name for dep in graph.get_leafs(level=1)] == ['b']
+        resolver.apply(graph.get('b'))
+        resolver.apply(graph.get('c'))
+        assert graph.get_leafs() == ()
+
+        # unapplied deps are leafs again, unused deps aren't
+        resolver.unapply(graph.get('a'))
+        assert [dep.name for dep in graph.get_leafs()] == ['a']
+    assert 'c' in graph
+    assert graph.get('c') in graph
+    assert root not in graph
+
+
+def test_rollback():
+    root = make_root(
+        root=Fake('', 'a', 'b'),
+        a=(Fake('1.0', 'c>=1'), ),
+        b=(Fake('1.0', 'c<2', 'd'), ),
+        c=(Fake('1.0'), Fake('2.0')),
+        d=(Fake('1.0'), ),
+    )
+    resolver = Resolver(graph=Graph(root), mutator=Mutator())
+    graph = resolver.graph
+    with patch(
+        target='dephell.controllers._dependency.get_repo',
+        return_value=graph._roots[0].repo,
+    ):
+        resolver.apply(root)
+        resolver.apply(graph.get('a'))
+        dep_c = graph.get('c')
+        constraint = str(dep_c.constraint)
+
+        graph.checkpoint()
+        resolver.apply(graph.get('b'))
+        assert str(dep_c.constraint) != constraint
+        assert 'd' in graph
+        graph.rollback()
+
+        assert str(dep_c.constraint) == constraint
+        assert 'd' not in graph
+        assert len(graph._layers) == 3
+        assert not graph.get('b').applied
+        assert [dep.name for dep in graph.get_leafs()] == ['b', 'c']
+
+
+def test_unapply_deep_graph():
+    count = 300
+    releases = {'p{}'.format(i): (Fake('1.0', 'p{}'.format(i + 1)), ) for i in range(count)}
+    releases['p{}'.format(count)] = (Fake('1.0'), )
+    root = make_root(root=Fake('', 'p0'), **releases)
+    resolver = Resolver(graph=Graph(root), mutator=Mutator())
+    with patch(
+        target='dephell.controllers._dependency.get_repo',
+        return_value=resolver.graph._roots[0].repo,
+    ):
+        assert resolver.resolve(silent=True)
+
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(count // 2)
+    try:
+        resolver.unapply(resolver.graph.get('p0'))
+    finally:
+        sys.setrecursionlimit(limit)
+    assert not any(dep.applied for dep in resolver.graph)
@@ -53,3 +53,74 @@ def test_mutator_diamond():
         ),
     )
     check(root=root, conflict='c', mutations=4)
+
+
+def test_learn_minimal_incompatibility():
+    root = make_root(
+        root=Fake('', 'a', 'b', 'd'),
+        a=(
+            Fake('1', 'c<2'),
+            Fake('2', 'c>=3'),
+        ),
+        b=(
+            Fake('1', 'c<2'),
+            Fake('2', 'c<3'),
+        ),
+        c=(
+            Fake('1'),
+            Fake('2'),
+            Fake('3'),
+        ),
+        d=(
+            Fake('1', 'c'),
+        ),
+    )
+    resolver = Resolver(graph=Graph(root), mutator=Mutator())
+    with patch(
+        target='dephell.controllers._dependency.get_repo',
+        return_value=resolver.graph._roots[0].repo,
+    ):
+        assert resolver.resolve(silent=True)
+
+    incompatibilities = resolver.mutator._incompatibilities
+    assert frozenset({('a', 0), ('b', 0)}) in incompatibilities
+    # `d` accepts any version of `c`, so it isn't a part of any conflict
+    assert not any(name == 'd' for names in incompatibilities for name, _ in names)
+
+
+def test_prune_learned_incompatibility():
+    root = make_root(
+        root=Fake('', 'a', 'b'),
+        a=(
+            Fake('1.0', 'c==1.0'),
+            Fake('2.0', 'c==2.0'),
+        ),
+        b=(
+            Fake('1.0', 'c==1.0'),
+            Fake('2.0', 'c==2.0'),
+        ),
+        c=(
+            Fake('1.0'),
+            Fake('2.0'),
+        ),
+    )
+    resolver = Resolver(graph=Graph(root), mutator=Mutator())
+    with patch(
+        target='dephell.controllers._dependency.get_repo',
+        return_value=resolver.graph._roots[0].repo,
+    ):
+        resolver.resolve(silent=True)
+    graph = resolver.graph
+    graph.conflict = graph.get('c')
+
+    mutator = Mutator()
+    mutator._incompatibilities.add(frozenset({('a', 1)}))
+    mutations = []
+    while True:
+        groups = mutator.mutate(graph)
+        if groups is None:
+            break
+        mutations.append({group.name: group.number for group in groups})
+    assert mutations
+    assert all(groups['a'] == 0 for groups in mutations)
+    assert mutator.pruned > 0
@@ -1,3 +1,14 @@
+# built-in
+from unittest.mock import patch
+
+# external
+import pytest
+
+# project
+from dephell.controllers import Graph, Mutator, Resolver
+from dephell.controllers._memo import ResolutionMemo
+from dephell.models.groups import Groups
+
 # app
 from ..helpers import Fake, check, make_root
 
@@ -242,3 +253,165 @@ def test_cyclic_dependencies_with_unapply():
         ),
     )
     check(root=root, a='==1', b='==1', c='==1')
+
+
+def test_prefetch_layer():
+    root = make_root(
+        root=Fake('', 'a', 'b<2'),
+        a=(
+            Fake('1', 'c'),
+            Fake('2', 'c'),
+        ),
+        b=(
+            Fake('1', 'c'),
+            Fake('2', 'c'),
+        ),
+        c=(
+            Fake('1'),
+        ),
+    )
+    resolver = Resolver(graph=Graph(root), mutator=Mutator())
+    with patch(
+        target='dephell.controllers._dependency.get_repo',
+        return_value=resolver.graph._roots[0].repo,
+    ):
+        resolver.apply(root)
+        deps = resolver.graph.get_leafs()
+        resolver.prefetch(deps)
+
+    releases = {dep.name: dep.groups.releases for dep in deps}
+    assert set(releases) == {'a', 'b'}
+    # the best release for `a`
+    assert releases['a'][0].dependencies is not None
+    # the best release for `b` doesn't match the constraint
+    assert all(release.dependencies is not None for release in releases['b'])
+
+
+@pytest.mark.parametrize('error, raised', [
+    (OSError('connection reset'), False),
+    (ValueError('invalid requirement'), False),
+    (TypeError('bug'), True),
+])
+def test_prefetch_errors(error, raised):
+    async def prefetch(self):
+        raise error
+
+    root = make_root(
+        root=Fake('', 'a', 'b'),
+        a=(Fake('1'), Fake('2')),
+        b=(Fake('1'), Fake('2')),
+    )
+    resolver = Resolver(graph=Graph(root), mutator=Mutator())
+    with patch(
+        target='dephell.controllers._dependency.get_repo',
+        return_value=resolver.graph._roots[0].repo,
+    ):
+        resolver.apply(root)
+        deps = resolver.graph.get_leafs()
+        assert deps
+        with patch.object(Groups, 'prefetch', prefetch):
+            if raised:
+                with pytest.raises(type(error)):
+                    resolver.prefetch(deps)
+            else:
+                resolver.prefetch(deps)
+
+
+def test_resolution_memo(temp_cache):
+    def resolve(root):
+        resolver = Resolver(graph=Graph(root), mutator=Mutator())
+        with patch(
+            target='dephell.controllers._dependency.get_repo',
+            return_value=resolver.graph._roots[0].repo,
+        ):
+            assert resolver.resolve(silent=True, memo=True)
+        versions = {dep.name: str(dep.group.best_release.version) for dep in resolver.graph}
+        return resolver, versions
+
+    releases = dict(
+        a=[Fake('1.0', 'b'), Fake('2.0', 'b<2')],
+        b=[Fake('1.0'), Fake('2.0')],
+    )
+    resolver, versions = resolve(make_root(root=Fake('', 'a', 'b>=2'), **releases))
+    assert versions == {'a': '1.0', 'b': '2.0'}
+    assert not resolver.pins
+    assert resolver.mutator.mutations > 0
+
+    # the same graph is resolved without mutations
+    resolver, versions = resolve(make_root(root=Fake('', 'a', 'b>=2'), **releases))
+    assert versions == {'a': '1.0', 'b': '2.0'}
+    assert resolver.pins == versions
+    assert resolver.mutator.mutations == 0
+
+    # new release invalidates the memo
+    releases['a'].append(Fake('3.0', 'b'))
+    resolver, versions = resolve(make_root(root=Fake('', 'a', 'b>=2'), **releases))
+    assert versions == {'a': '3.0', 'b': '2.0'}
+    assert not resolver.pins
+
+
+def test_resolution_memo_with_links(temp_cache):
+    root = make_root(
+        root=Fake('', 'a'),
+        a=[Fake('1.0', 'b')],
+        b=[Fake('1.0')],
+    )
+    resolver = Resolver(graph=Graph(root), mutator=Mutator())
+    memo = ResolutionMemo.from_graph(resolver.graph)
+    with patch(
+        target='dephell.controllers._dependency.get_repo',
+        return_value=resolver.graph._roots[0].repo,
+    ):
+        assert resolver.resolve(silent=True)
+    # a transitive dependency is installed from VCS or a local path
+    resolver.graph.get('b').link = 'git+https://github.com/dephell/b.git'
+    memo.save(resolver)
+    assert memo.cache.load() is None
+
+
+@pytest.mark.parametrize('pins, expected, pinned', [
+    # locked versions are kept
+    ({'a': '1.0', 'c': '1.0'}, {'a': '1.0', 'b': '1.0', 'c': '1.0'}, True),
+    # pinned versions don't fit new constraints, resolve from scratch
+    ({'a': '1.0', 'b': '2.0'}, {'a': '2.0', 'b': '1.0', 'c': '2.0'}, False),
+])
+def test_resolve_with_pins(pins, expected, pinned):
+    root = make_root(
+        root=Fake('', 'a', 'c'),
+        a=(Fake('1.0', 'b'), Fake('2.0', 'b')),
+        b=(Fake('1.0'), Fake('2.0')),
+        c=(Fake('1.0', 'b<2'), Fake('2.0', 'b<2')),
+    )
+    resolver = Resolver(graph=Graph(root), mutator=Mutator())
+    resolver.pins = pins
+    with patch(
+        target='dephell.controllers._dependency.get_repo',
+        return_value=resolver.graph._roots[0].repo,
+    ):
+        assert resolver.resolve(silent=True)
+    versions = {dep.name: str(dep.group.best_release.version) for dep in resolver.graph}
+    assert versions == expected
+    assert bool(resolver.pins) is pinned
+
+
+def test_unpin():
+    root = make_root(
+        root=Fake('', 'a', 'c'),
+        a=(Fake('1.0', 'b'), Fake('2.0', 'b')),
+        b=(Fake('1.0', 'd'), Fake('2.0', 'd')),
+        c=(Fake('1.0'), Fake('2.0')),
+        d=(Fake('1.0'), Fake('2.0')),
+    )
+    resolver = Resolver(graph=Graph(root), mutator=Mutator())
+    resolver.pins = {'a': '1.0', 'b': '1.0', 'c': '1.0', 'd': '1.0'}
+    with patch(
+        target='dephell.controllers._dependency.get_repo',
+        return_value=resolver.graph._roots[0].repo,
+    ):
+        assert resolver.resolve(silent=True)
+        resolver.unpin(resolver.graph.get('b'))
+        assert resolver.resolve(silent=True)
+    versions = {dep.name: str(dep.group.best_release.version) for dep in resolver.graph}
+    # only `b` is unpinned, its children keep pins
+    assert versions == {'a': '1.0', 'b': '2.0', 'c': '1.0', 'd': '1.0'}
+    assert set(resolver.pins) == {'a', 'c', 'd'}
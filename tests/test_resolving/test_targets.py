@@ -0,0 +1,66 @@
+# built-in
+from unittest.mock import patch
+
+# external
+import pytest
+
+# project
+from dephell.controllers import Graph, Mutator, Resolver
+from dephell.models import Target
+
+# app
+from ..helpers import Fake, make_root
+
+
+def resolve(root) -> Resolver:
+    resolver = Resolver(graph=Graph(root), mutator=Mutator())
+    with patch(
+        target='dephell.controllers._dependency.get_repo',
+        return_value=resolver.graph._roots[0].repo,
+    ):
+        assert resolver.resolve(silent=True)
+    return resolver
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('3.8', dict(python_version='3.8', implementation_name='cpython')),
+    ('3.10:linux', dict(python_version='3.10', sys_platform='linux', os_name='posix')),
+    ('pypy3.9:win32', dict(implementation_name='pypy', platform_system='Windows')),
+])
+def test_parse_target(text: str, expected: dict):
+    env = Target.parse(text).environment
+    for key, value in expected.items():
+        assert env[key] == value
+
+
+def test_get_targets():
+    root = make_root(
+        root=Fake('', 'a', 'b; sys_platform == "win32"', 'c; python_version < "3.9"'),
+        a=(Fake('1.0'), ),
+        b=(Fake('1.0', 'd'), ),
+        c=(Fake('1.0', 'd; sys_platform == "linux"'), ),
+        d=(Fake('1.0'), ),
+    )
+    resolver = resolve(root)
+    targets = [Target.parse(text) for text in ('3.8:linux', '3.10:linux', '3.10:win32')]
+    matrix = resolver.get_targets(targets)
+    assert matrix['a'] == {'3.8:linux', '3.10:linux', '3.10:win32'}
+    assert matrix['b'] == {'3.10:win32'}
+    assert matrix['c'] == {'3.8:linux'}
+    assert matrix['d'] == {'3.8:linux', '3.10:win32'}
+
+
+def test_apply_targets():
+    root = make_root(
+        root=Fake('', 'a', 'b; sys_platform == "win32"', 'c; python_version < "3.9"'),
+        a=(Fake('1.0'), ),
+        b=(Fake('1.0'), ),
+        c=(Fake('1.0', 'd'), ),
+        d=(Fake('1.0'), ),
+    )
+    resolver = resolve(root)
+    resolver.apply_targets([Target.parse('3.8:linux'), Target.parse('3.10:linux')])
+    applied = {dep.name: dep for dep in resolver.graph if dep.applied}
+    assert set(applied) == {'a', 'c', 'd'}
+    assert not applied['a'].marker
+    assert str(applied['d'].marker) == 'python_version == "3.8" and sys_platform == "linux"'